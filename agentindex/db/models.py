@@ -8,13 +8,14 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
     create_engine, Column, String, Float, DateTime, Text, Boolean, Integer,
-    Index, func
+    LargeBinary, Index, func
 )
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY, UUID
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.sql import text
 import uuid
 import os
+import threading
 
 Base = declarative_base()
 
@@ -215,6 +216,18 @@ class CrawlJob(Base):
     )
 
 
+class EtagCache(Base):
+    """
+    Last ETag and body seen per GET URL, for conditional re-fetches.
+    """
+    __tablename__ = "etag_cache"
+
+    url = Column(Text, primary_key=True)            # full URL including query string
+    etag = Column(Text, nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+
+
 class SystemStatus(Base):
     """
     System health metrics, updated by Vakten.
@@ -238,13 +251,19 @@ _engine = None
 _write_engine = None
 _Session = None
 _WriteSession = None
+# Guards lazy engine creation when threads (e.g. verify's checks) race to it
+_engine_lock = threading.Lock()
 
 def get_engine():
     """Default engine. Respects DATABASE_URL env var (set by LaunchAgent plists
     for crawlers pointing to Nbg primary). Falls back to local replica for the
     API process which uses NERQ_PG_PRIMARY/NERQ_PG_REPLICA instead."""
     global _engine
-    if _engine is None:
+    if _engine is not None:
+        return _engine
+    with _engine_lock:
+        if _engine is not None:
+            return _engine
         database_url = os.getenv("DATABASE_URL")
         if not database_url:
             from agentindex.db_config import get_read_dsn
@@ -0,0 +1,140 @@
+"""
+Shared pieces of the async registry spiders (npm, PyPI, MCP).
+
+HTTP client settings, JSON decoding, bounded fan-out, keyword detection,
+and the bulk insert of new agents rows with a per-crawl memory of which
+source_urls are already indexed.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+import httpx
+from agentindex.db.models import Agent
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# HTTP/2 lets the fan-out share one multiplexed connection per host; it
+# needs the h2 package (httpx[http2]), so fall back to HTTP/1.1 without it.
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
+# orjson parses the large search/package payloads several times faster than
+# the stdlib json; both accept the raw bytes.
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+def fast_json(response: httpx.Response):
+    """Decode a JSON response body straight from its bytes."""
+    return json_loads(response.content)
+
+
+async def bounded(sem: asyncio.Semaphore, coro):
+    """Await coro while holding sem, to cap how many run at once."""
+    async with sem:
+        return await coro
+
+
+class KeywordDetector:
+    """
+    Labels frameworks and protocols from (label, keywords) tables.
+
+    Calling it with lowercased sources returns (frameworks, protocols) whose
+    keywords occur in any source. Each distinct keyword is scanned once, even
+    when several labels share it. No keyword contains a space, so scanning the
+    sources separately matches exactly what scanning them space-joined would.
+    """
+
+    def __init__(self, frameworks: tuple, protocols: tuple):
+        self.frameworks = frameworks
+        self.protocols = protocols
+        self.keywords = frozenset(
+            keyword for _, keywords in frameworks + protocols for keyword in keywords
+        )
+
+    def __call__(self, sources: tuple) -> tuple:
+        hits = {
+            keyword for keyword in self.keywords
+            if any(keyword in source for source in sources)
+        }
+        frameworks = [label for label, keywords in self.frameworks if not hits.isdisjoint(keywords)]
+        protocols = [label for label, keywords in self.protocols if not hits.isdisjoint(keywords)]
+        return frameworks, protocols
+
+
+class AgentInsertMixin:
+    """
+    Bulk insert of new agents rows for a spider with a `session`.
+
+    SOURCE is the agents.source value the spider writes. `_seen` holds the
+    source_urls known to be indexed, loaded once per crawl by _load_seen().
+    """
+
+    SOURCE = ""
+
+    @property
+    def _logger(self) -> logging.Logger:
+        return logging.getLogger(f"agentindex.spiders.{self.SOURCE}")
+
+    def _load_seen(self):
+        """Load every source_url this spider has indexed, once per crawl."""
+        try:
+            self._seen = set(self.session.execute(
+                select(Agent.source_url).where(Agent.source == self.SOURCE)
+            ).scalars())
+        except Exception as e:
+            self.session.rollback()
+            self._logger.warning(f"Could not preload indexed {self.SOURCE} URLs: {e}")
+            self._seen = set()
+
+    def _existing_urls(self, urls: list) -> set:
+        """
+        Return the subset of source_urls already indexed. URLs this spider
+        has seen are answered from memory; only the rest (e.g. rows written
+        under another source) cost one IN query.
+        """
+        known = {url for url in urls if url in self._seen}
+        unknown = [url for url in urls if url not in self._seen]
+        if not unknown:
+            return known
+        found = set(self.session.execute(
+            select(Agent.source_url).where(Agent.source_url.in_(unknown))
+        ).scalars())
+        self._seen |= found
+        return known | found
+
+    def _insert_rows(self, rows: list) -> int:
+        """
+        Insert one page of new agent rows with a single multi-row INSERT.
+        Rows whose source_url is already indexed are skipped by ON CONFLICT.
+        Returns the number of rows actually inserted.
+        """
+        if not rows:
+            return 0
+        now = datetime.utcnow()  # one timestamp for the whole batch
+        for row in rows:
+            row["first_indexed"] = row["last_crawled"] = now
+        stmt = (
+            pg_insert(Agent)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["source_url"])
+            .returning(Agent.source_url)
+        )
+        try:
+            inserted = self.session.execute(stmt).scalars().all()
+            self.session.commit()
+            self._seen.update(inserted)
+            return len(inserted)
+        except Exception as e:
+            self.session.rollback()
+            self._logger.error(f"Error inserting {len(rows)} agents: {e}")
+            return 0
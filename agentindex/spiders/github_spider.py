@@ -16,12 +16,16 @@ We use many specific queries to maximize coverage.
 
 import os
 import time
+import hashlib
 import logging
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from github import Github, GithubException
 from agentindex.db.models import Agent, CrawlJob, get_session
-from sqlalchemy import text, select
+from sqlalchemy import text, select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 logger = logging.getLogger("agentindex.spiders.github")
 
@@ -50,6 +54,98 @@ SEARCH_QUERIES = [
     "agent registry",
 ]
 
+# framework -> substrings that indicate it (matched against lowercased text)
+FRAMEWORK_KEYWORDS = (
+    ("langchain", ("langchain",)),
+    ("crewai", ("crewai", "crew-ai")),
+    ("autogen", ("autogen", "auto-gen")),
+    ("llamaindex", ("llamaindex", "llama-index", "llama_index")),
+    ("semantic-kernel", ("semantic-kernel", "semantic_kernel")),
+    ("openai", ("openai", "gpt-4", "gpt4")),
+    ("anthropic", ("anthropic", "claude")),
+    ("mcp", ("model-context-protocol", "mcp-server", "mcp_server")),
+    ("a2a", ("agent2agent", "a2a-protocol")),
+    ("ollama", ("ollama",)),
+    ("huggingface", ("huggingface", "transformers")),
+)
+
+# protocol -> substrings that indicate it (skill.md also implies mcp)
+PROTOCOL_KEYWORDS = (
+    ("mcp", ("mcp",)),
+    ("a2a", ("a2a", "agent2agent")),
+    ("rest", ("rest", "api")),
+    ("grpc", ("grpc",)),
+    ("websocket", ("websocket",)),
+)
+
+# Metadata text fields the detectors scan
+DETECTION_FIELDS = ("readme", "skill_md", "agent_md", "package_json", "pyproject")
+
+# Files larger than this are skipped
+MAX_FILE_SIZE = 100000
+
+# Files read from each new repo, fetched concurrently (each is one REST call)
+REPO_FILES = ("README.md", "skill.md", "agent.md", "package.json", "pyproject.toml", "setup.py")
+
+# Unchanged agents are refreshed with one bulk UPDATE per this many rows
+UPDATE_BATCH_SIZE = 200
+
+# Max tags stored per agent (same cap as the HuggingFace spider)
+MAX_TAGS = 20
+
+
+def _content_hash(*parts: Optional[str]) -> str:
+    """Short, stable hash of one or more text blobs (None counts as empty)."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update((part or "").encode("utf-8", errors="ignore"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """PyGithub returns tz-aware UTC datetimes; our DateTime columns are naive UTC."""
+    if dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _lower_fields(metadata: dict) -> dict:
+    """
+    Lowercased copy of each detection field (plus joined topics). Fields are
+    kept separate: the keywords contain no spaces, so scanning each one on
+    its own matches exactly what scanning a space-joined blob would, without
+    building and lowercasing a ~20KB concatenation per detector.
+    """
+    lowered = {key: (metadata.get(key) or "").lower() for key in DETECTION_FIELDS}
+    lowered["topics"] = " ".join(metadata.get("topics") or []).lower()
+    return lowered
+
+
+def _haystacks(lowered: dict, keys: tuple) -> tuple:
+    """The non-empty lowered fields among keys."""
+    return tuple(lowered[key] for key in keys if lowered[key])
+
+
+def _contains_any(haystacks: tuple, needles: tuple) -> bool:
+    """True if any needle occurs in any haystack (str.__contains__, C fastsearch)."""
+    return any(needle in haystack for needle in needles for haystack in haystacks)
+
+
+def _match_keywords(haystacks: tuple, table: tuple) -> list:
+    """Labels from a (label, keywords) table whose keywords occur in the haystacks."""
+    return [label for label, keywords in table if _contains_any(haystacks, keywords)]
+
+
+def _normalize_tags(tags) -> list:
+    """Lowercase, strip, dedupe (keeping order) and cap a topic list."""
+    seen = {}
+    for tag in tags or ():
+        tag = (tag or "").strip().lower()
+        if tag:
+            seen.setdefault(tag, None)
+    return list(seen)[:MAX_TAGS]
+
 
 class GitHubSpider:
     """
@@ -60,8 +156,22 @@ class GitHubSpider:
         token = os.getenv("GITHUB_TOKEN")
         if not token:
             raise ValueError("GITHUB_TOKEN environment variable required")
+        self.token = token
         self.github = Github(token, per_page=100)
         self.session = get_session()
+        # New agent rows waiting for the per-query bulk insert, keyed by source_url
+        self._new_rows: dict = {}
+        # Narrow stars/forks/last_crawled updates for agents whose README is unchanged
+        self._pending_updates: list = []
+        # Repos already handled this crawl cycle — search queries overlap heavily
+        self._seen_repos: set = set()
+        # Set when a bulk insert/update fails; such a query run is not complete
+        self._write_failed = False
+        # Per-repo file fetches run on a thread pool that lives for one crawl().
+        # PyGithub's Requester is not thread-safe, so each worker thread
+        # talks to GitHub through its own client (see _thread_repo).
+        self._file_pool: Optional[ThreadPoolExecutor] = None
+        self._thread_local = threading.local()
 
     def crawl(self, max_results_per_query: int = 500) -> dict:
         """
@@ -75,7 +185,20 @@ class GitHubSpider:
             "repos_updated": 0,
             "errors": 0,
         }
+        started_at = datetime.utcnow()
+        self._seen_repos.clear()
+        self._file_pool = ThreadPoolExecutor(max_workers=len(REPO_FILES))
+        try:
+            self._crawl_queries(stats, max_results_per_query, started_at)
+        finally:
+            self._file_pool.shutdown()
+            self._file_pool = None
+
+        logger.info(f"GitHub crawl complete: {stats}")
+        return stats
 
+    def _crawl_queries(self, stats: dict, max_results_per_query: int, started_at: datetime):
+        """Run every search query, flushing its rows even if it fails, then log the crawl job."""
         for query in SEARCH_QUERIES:
             try:
                 query_stats = self._crawl_query(query, max_results_per_query)
@@ -83,6 +206,7 @@ class GitHubSpider:
                 stats["repos_found"] += query_stats["found"]
                 stats["repos_new"] += query_stats["new"]
                 stats["repos_updated"] += query_stats["updated"]
+                stats["errors"] += query_stats["errors"]
 
                 # Log progress
                 logger.info(
@@ -114,6 +238,12 @@ class GitHubSpider:
                 logger.error(f"Error crawling query '{query}': {e}")
                 stats["errors"] += 1
 
+            finally:
+                # Rows left over from a query that raised mid-way are written
+                # now, so they don't land in the next query's CrawlJob
+                stats["repos_new"] += len(self._flush_new_rows())
+                self._flush_updates()
+
         # Log crawl job
         job = CrawlJob(
             source="github",
@@ -122,7 +252,7 @@ class GitHubSpider:
             items_found=stats["repos_found"],
             items_new=stats["repos_new"],
             items_updated=stats["repos_updated"],
-            started_at=datetime.utcnow(),
+            started_at=started_at,
             completed_at=datetime.utcnow(),
         )
         self.session.add(job)
@@ -130,18 +260,27 @@ class GitHubSpider:
             self.session.commit()
         except Exception:
             self.session.rollback()
-            self.session = get_session()
-
-        logger.info(f"GitHub crawl complete: {stats}")
-        return stats
 
     def _crawl_query(self, query: str, max_results: int) -> dict:
-        """Crawl a single search query."""
-        stats = {"found": 0, "new": 0, "updated": 0}
+        """
+        Crawl a single search query.
+
+        Only repos pushed since this query's last complete run are requested
+        (GitHub's pushed:> qualifier), so a re-crawl scans the delta rather
+        than every recently-updated repo again.
+        """
+        stats = {"found": 0, "new": 0, "updated": 0, "errors": 0}
+        started_at = datetime.utcnow()
+        self._write_failed = False
+
+        search_query = query
+        since = self._last_completed_run(query)
+        if since:
+            search_query = f"{query} pushed:>{since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
 
         # Search for repositories
         results = self.github.search_repositories(
-            query=query,
+            query=search_query,
             sort="updated",
             order="desc",
         )
@@ -154,24 +293,113 @@ class GitHubSpider:
 
             try:
                 result = self._process_repo(repo)
-                if result == "new":
-                    stats["new"] += 1
-                elif result == "updated":
+                if result == "updated":
                     stats["updated"] += 1
             except Exception as e:
+                stats["errors"] += 1
                 logger.error(f"Error processing repo {repo.full_name}: {e}")
 
             # Small pause to be respectful
             if i % 50 == 0 and i > 0:
                 time.sleep(1)
 
+        stats["new"] = len(self._flush_new_rows())
+        self._flush_updates()
+
+        # Only a "completed" run advances the pushed:> watermark, so any run
+        # that may have lost repos must not be recorded as one: a failed
+        # bulk write, repos that raised, or a run cut off at max_results
+        # (the delta was not fully seen). A query that always hits
+        # max_results therefore keeps crawling from its last complete run
+        # (or from scratch) until a run gets through its whole delta.
+        if self._write_failed:
+            status, error = "failed", "bulk insert/update failed"
+        elif stats["errors"]:
+            status, error = "partial", f"{stats['errors']} repos failed to process"
+        elif stats["found"] >= max_results:
+            status, error = "partial", None
+        else:
+            status, error = "completed", None
+        self.session.add(CrawlJob(
+            source="github",
+            query=query,
+            status=status,
+            items_found=stats["found"],
+            items_new=stats["new"],
+            items_updated=stats["updated"],
+            error_message=error,
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+        ))
+        try:
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+
         return stats
 
+    def _last_completed_run(self, query: str) -> Optional[datetime]:
+        """Start time of the last complete crawl of this query, if any."""
+        try:
+            return self.session.execute(
+                select(func.max(CrawlJob.started_at)).where(
+                    CrawlJob.source == "github",
+                    CrawlJob.query == query,
+                    CrawlJob.status == "completed",
+                )
+            ).scalar()
+        except Exception:
+            self.session.rollback()
+            return None
+
+    def _flush_new_rows(self) -> dict:
+        """
+        Insert all pending new agents in a single INSERT ... RETURNING.
+        Returns {source_url: id} for the inserted rows, so callers get the
+        generated keys without a SELECT per row. URLs inserted meanwhile by
+        another spider (the MCP spider indexes the same GitHub URLs) are
+        skipped rather than failing the whole batch.
+        """
+        if not self._new_rows:
+            return {}
+        rows = list(self._new_rows.values())
+        self._new_rows = {}
+
+        # Normalize tags and stamp the whole batch in one pass before insert;
+        # first_indexed == last_crawled marks a row never re-crawled
+        now = datetime.utcnow()
+        for row in rows:
+            row["tags"] = _normalize_tags(row["tags"])
+            row["first_indexed"] = row["last_crawled"] = now
+
+        try:
+            result = self.session.execute(
+                pg_insert(Agent)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["source_url"])
+                .returning(Agent.id, Agent.source_url)
+            )
+            id_map = {r.source_url: r.id for r in result}
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self._write_failed = True
+            logger.error(f"Error inserting {len(rows)} new agents: {e}")
+            return {}
+
+        logger.debug(f"Inserted {len(id_map)} new agents pending parsing")
+        return id_map
+
     def _process_repo(self, repo) -> str:
         """
         Process a single GitHub repository.
         Returns 'new', 'updated', or 'skipped'.
         """
+        # Already processed by an earlier (overlapping) query this cycle
+        if repo.full_name in self._seen_repos:
+            return "skipped"
+        self._seen_repos.add(repo.full_name)
+
         source_url = repo.html_url
 
         # Check if already indexed
@@ -182,38 +410,35 @@ class GitHubSpider:
         if existing:
             # Update if repo has been modified since last crawl
             if repo.updated_at and existing.last_crawled:
-                if str(repo.updated_at) > str(existing.last_crawled):
+                if _naive_utc(repo.updated_at) > _naive_utc(existing.last_crawled):
                     self._update_agent(existing, repo)
                     return "updated"
             return "skipped"
 
-        # New agent — extract data and store
-        agent = self._create_agent(repo)
-        if agent:
-            self.session.add(agent)
-            try:
-                self.session.commit()
-            except Exception:
-                self.session.rollback()
-                self.session = get_session()
+        # New agent — extract data and queue for the bulk insert
+        row = self._create_agent(repo)
+        if row:
+            self._new_rows[source_url] = row
             return "new"
 
         return "skipped"
 
-    def _create_agent(self, repo) -> Optional[Agent]:
-        """Create a new Agent record from a GitHub repo."""
+    def _create_agent(self, repo) -> Optional[dict]:
+        """Build a new agents row (column name -> value) from a GitHub repo."""
 
-        # Read README
-        readme_content = self._get_file_content(repo, "README.md")
+        # Read README and special files in parallel, skipping files the
+        # root tree listing shows are missing or too large
+        root_files = self._list_root_files(repo)
+        files = self._get_files(repo, REPO_FILES, root_files)
+        readme_content = files["README.md"]
         if not readme_content:
-            readme_content = self._get_file_content(repo, "readme.md")
+            readme_content = self._get_file_content(repo, "readme.md", root_files)
 
-        # Read special files
-        skill_md = self._get_file_content(repo, "skill.md")
-        agent_md = self._get_file_content(repo, "agent.md")
-        package_json = self._get_file_content(repo, "package.json")
-        pyproject = self._get_file_content(repo, "pyproject.toml")
-        setup_py = self._get_file_content(repo, "setup.py")
+        skill_md = files["skill.md"]
+        agent_md = files["agent.md"]
+        package_json = files["package.json"]
+        pyproject = files["pyproject.toml"]
+        setup_py = files["setup.py"]
 
         # Build raw metadata for later parsing by AI
         raw_metadata = {
@@ -226,6 +451,7 @@ class GitHubSpider:
             "language": repo.language,
             "description": repo.description,
             "full_name": repo.full_name,
+            "readme_hash": _content_hash(readme_content) if readme_content else None,
         }
 
         # Skip repos with no useful content
@@ -233,129 +459,164 @@ class GitHubSpider:
             if not repo.description:
                 return None
 
-        # Detect frameworks from topics and files
-        frameworks = self._detect_frameworks(repo, raw_metadata)
-
-        # Detect protocols
-        protocols = self._detect_protocols(raw_metadata)
-
-        # Determine invocation method
-        invocation = self._detect_invocation(raw_metadata)
+        # Detect frameworks, protocols and invocation method
+        frameworks, protocols, invocation = self._detect_all(repo, raw_metadata)
 
-        agent = Agent(
-            source="github",
-            source_url=repo.html_url,
-            source_id=repo.full_name,
-            name=repo.name,
-            description=repo.description or "",
-            author=repo.owner.login if repo.owner else None,
-            license=repo.license.spdx_id if repo.license else None,
-            language=repo.language,
-            stars=repo.stargazers_count,
-            forks=repo.forks_count,
-            last_source_update=repo.updated_at,
-            frameworks=frameworks,
-            protocols=protocols,
-            invocation=invocation,
-            tags=repo.topics if hasattr(repo, 'topics') else [],
-            raw_metadata=raw_metadata,
-            crawl_status="indexed",  # needs parsing by AI next
-            first_indexed=datetime.utcnow(),
-            last_crawled=datetime.utcnow(),
-        )
-
-        return agent
+        return {
+            "source": "github",
+            "source_url": repo.html_url,
+            "source_id": repo.full_name,
+            "name": repo.name,
+            "description": repo.description or "",
+            "author": repo.owner.login if repo.owner else None,
+            "license": repo.license.spdx_id if repo.license else None,
+            "language": repo.language,
+            "stars": repo.stargazers_count,
+            "forks": repo.forks_count,
+            "last_source_update": repo.updated_at,
+            "frameworks": frameworks,
+            "protocols": protocols,
+            "invocation": invocation,
+            "tags": repo.topics if hasattr(repo, 'topics') else [],
+            "raw_metadata": raw_metadata,
+            "crawl_status": "indexed",  # needs parsing by AI next
+        }
 
     def _update_agent(self, agent: Agent, repo):
-        """Update an existing agent with fresh data from GitHub."""
-        agent.stars = repo.stargazers_count
-        agent.forks = repo.forks_count
-        agent.last_source_update = repo.updated_at
-        agent.last_crawled = datetime.utcnow()
+        """
+        Update an existing agent with fresh data from GitHub.
 
+        raw_metadata (the large JSONB blob) is only rewritten when the README
+        actually changed. Otherwise the popularity fields are queued for a
+        narrow bulk UPDATE, which avoids rewriting the TOASTed row.
+        """
+        values = {
+            "stars": repo.stargazers_count,
+            "forks": repo.forks_count,
+            "last_source_update": repo.updated_at,
+            "last_crawled": datetime.utcnow(),
+        }
         if hasattr(repo, 'topics'):
-            agent.tags = repo.topics
+            values["tags"] = _normalize_tags(repo.topics)
 
-        # Re-read README for re-parsing
+        # Re-read README for re-parsing — only if it actually changed
         readme_content = self._get_file_content(repo, "README.md")
-        if readme_content:
-            agent.raw_metadata = {
-                **agent.raw_metadata,
-                "readme": readme_content[:10000],
-            }
-            agent.crawl_status = "indexed"  # re-parse needed
+        readme_hash = _content_hash(readme_content) if readme_content else None
+
+        if not readme_hash or readme_hash == (agent.raw_metadata or {}).get("readme_hash"):
+            self._pending_updates.append({"id": agent.id, **values})
+            if len(self._pending_updates) >= UPDATE_BATCH_SIZE:
+                self._flush_updates()
+            return
+
+        for key, value in values.items():
+            setattr(agent, key, value)
+        agent.raw_metadata = {
+            **(agent.raw_metadata or {}),
+            "readme": readme_content[:10000],
+            "readme_hash": readme_hash,
+        }
+        agent.crawl_status = "indexed"  # re-parse needed
 
         try:
             self.session.commit()
         except Exception:
             self.session.rollback()
-            self.session = get_session()
+            self._write_failed = True
+
+    def _flush_updates(self):
+        """Apply queued narrow updates as a single bulk UPDATE by primary key."""
+        if not self._pending_updates:
+            return
+        rows = self._pending_updates
+        self._pending_updates = []
 
-    def _get_file_content(self, repo, path: str) -> Optional[str]:
-        """Safely get file content from a repo."""
+        try:
+            self.session.execute(update(Agent), rows)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self._write_failed = True
+            logger.error(f"Error updating {len(rows)} agents: {e}")
+
+    def _list_root_files(self, repo) -> Optional[dict]:
+        """
+        Map root-level file path -> size in bytes using one git tree call,
+        which carries sizes but no file bodies. Returns None if unavailable.
+        """
+        try:
+            tree = repo.get_git_tree(repo.default_branch)
+            return {entry.path: entry.size for entry in tree.tree if entry.type == "blob"}
+        except Exception:
+            return None
+
+    def _thread_repo(self, full_name: str):
+        """
+        Lazy Repository handle on the calling thread's own Github client.
+        A client's Requester keeps one connection per host and sets up each
+        request on it before sending, so sharing one client across threads
+        can swap responses between requests.
+        """
+        github = getattr(self._thread_local, "github", None)
+        if github is None:
+            github = self._thread_local.github = Github(self.token, per_page=100)
+        return github.get_repo(full_name, lazy=True)
+
+    def _get_files(self, repo, paths, root_files: Optional[dict] = None) -> dict:
+        """Fetch several files from a repo concurrently. Missing files map to None."""
+        if self._file_pool is None:  # called outside crawl()
+            return {path: self._get_file_content(repo, path, root_files) for path in paths}
+        contents = self._file_pool.map(
+            lambda path: self._get_file_content(self._thread_repo(repo.full_name), path, root_files),
+            paths,
+        )
+        return dict(zip(paths, contents))
+
+    def _get_file_content(self, repo, path: str, root_files: Optional[dict] = None) -> Optional[str]:
+        """
+        Safely get file content from a repo. When a root tree listing is
+        given, missing or oversized files are skipped without a request.
+        """
+        if root_files is not None and root_files.get(path, MAX_FILE_SIZE + 1) > MAX_FILE_SIZE:
+            return None
         try:
             content = repo.get_contents(path)
-            if content.size > 100000:  # skip very large files
+            if content.size > MAX_FILE_SIZE:  # skip very large files
                 return None
             return content.decoded_content.decode("utf-8", errors="ignore")
         except Exception:
             return None
 
-    def _detect_frameworks(self, repo, metadata: dict) -> list:
-        """Detect which AI frameworks this agent uses."""
-        frameworks = []
-        text_to_check = " ".join([
-            metadata.get("readme") or "",
-            metadata.get("package_json") or "",
-            metadata.get("pyproject") or "",
-            " ".join(metadata.get("topics") or []),
-        ]).lower()
-
-        framework_keywords = {
-            "langchain": ["langchain"],
-            "crewai": ["crewai", "crew-ai"],
-            "autogen": ["autogen", "auto-gen"],
-            "llamaindex": ["llamaindex", "llama-index", "llama_index"],
-            "semantic-kernel": ["semantic-kernel", "semantic_kernel"],
-            "openai": ["openai", "gpt-4", "gpt4"],
-            "anthropic": ["anthropic", "claude"],
-            "mcp": ["model-context-protocol", "mcp-server", "mcp_server"],
-            "a2a": ["agent2agent", "a2a-protocol"],
-            "ollama": ["ollama"],
-            "huggingface": ["huggingface", "transformers"],
-        }
+    def _detect_all(self, repo, metadata: dict) -> tuple:
+        """Run framework/protocol/invocation detection over one lowered copy of the metadata."""
+        lowered = _lower_fields(metadata)
+        return (
+            self._detect_frameworks(repo, metadata, lowered),
+            self._detect_protocols(metadata, lowered),
+            self._detect_invocation(metadata, lowered),
+        )
 
-        for framework, keywords in framework_keywords.items():
-            if any(kw in text_to_check for kw in keywords):
-                frameworks.append(framework)
+    def _detect_frameworks(self, repo, metadata: dict, lowered: Optional[dict] = None) -> list:
+        """Detect which AI frameworks this agent uses."""
+        lowered = lowered or _lower_fields(metadata)
+        haystacks = _haystacks(lowered, ("readme", "package_json", "pyproject", "topics"))
 
-        return frameworks
+        return _match_keywords(haystacks, FRAMEWORK_KEYWORDS)
 
-    def _detect_protocols(self, metadata: dict) -> list:
+    def _detect_protocols(self, metadata: dict, lowered: Optional[dict] = None) -> list:
         """Detect which agent protocols are supported."""
-        protocols = []
-        text_to_check = " ".join([
-            metadata.get("readme") or "",
-            metadata.get("skill_md") or "",
-            metadata.get("agent_md") or "",
-        ]).lower()
-
-        if "mcp" in text_to_check or metadata.get("skill_md"):
-            protocols.append("mcp")
-        if "a2a" in text_to_check or "agent2agent" in text_to_check:
-            protocols.append("a2a")
-        if "rest" in text_to_check or "api" in text_to_check:
-            protocols.append("rest")
-        if "grpc" in text_to_check:
-            protocols.append("grpc")
-        if "websocket" in text_to_check:
-            protocols.append("websocket")
+        lowered = lowered or _lower_fields(metadata)
+        haystacks = _haystacks(lowered, ("readme", "skill_md", "agent_md"))
 
+        protocols = _match_keywords(haystacks, PROTOCOL_KEYWORDS)
+        if metadata.get("skill_md") and "mcp" not in protocols:
+            protocols.insert(0, "mcp")
         return protocols
 
-    def _detect_invocation(self, metadata: dict) -> dict:
+    def _detect_invocation(self, metadata: dict, lowered: Optional[dict] = None) -> dict:
         """Detect how to invoke this agent."""
         invocation = {"type": "github"}
+        lowered = lowered or _lower_fields(metadata)
 
         # Check for npm package
         if metadata.get("package_json"):
@@ -372,11 +633,11 @@ class GitHubSpider:
             invocation["type"] = "pip"
 
         # Check for MCP
-        if metadata.get("skill_md") or "mcp" in " ".join(metadata.get("topics") or []):
+        if metadata.get("skill_md") or any("mcp" in t for t in metadata.get("topics") or []):
             invocation["type"] = "mcp"
 
         # Check for Docker
-        text = (metadata.get("readme") or "").lower()
+        text = lowered["readme"]
         if "docker" in text and ("docker-compose" in text or "dockerfile" in text):
             invocation["docker"] = True
 
@@ -0,0 +1,39 @@
+"""
+Optional on-disk HTTP cache for the async spiders.
+
+Set SPIDER_HTTP_CACHE_DIR to a directory to cache GET responses between
+runs (useful when iterating on a spider against unchanged upstream data).
+Freshness follows the servers' Cache-Control headers, and stale entries
+that carried an ETag are revalidated with If-None-Match.
+Needs hishel (0.x); without it, or with the variable unset, spiders get a
+plain transport.
+"""
+
+import logging
+import os
+
+import httpx
+
+logger = logging.getLogger("agentindex.spiders.http_cache")
+
+HTTP_CACHE_DIR = os.getenv("SPIDER_HTTP_CACHE_DIR", "")
+HTTP_CACHE_TTL = int(os.getenv("SPIDER_HTTP_CACHE_TTL", "3600"))  # seconds kept on disk
+
+
+def async_transport(http2: bool, limits: httpx.Limits) -> httpx.AsyncBaseTransport:
+    """
+    Transport for a spider's AsyncClient. The client ignores its own
+    http2/limits arguments once a transport is passed, so both go here.
+    """
+    transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+    if not HTTP_CACHE_DIR:
+        return transport
+    try:
+        import hishel
+    except ImportError:
+        logger.warning("SPIDER_HTTP_CACHE_DIR is set but hishel is not installed; caching disabled")
+        return transport
+
+    from pathlib import Path
+    storage = hishel.AsyncFileStorage(base_path=Path(HTTP_CACHE_DIR), ttl=HTTP_CACHE_TTL)
+    return hishel.AsyncCacheTransport(transport=transport, storage=storage)
@@ -87,8 +87,6 @@ class HuggingFaceSpider:
             self.session.commit()
         except Exception:
             self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
 
         logger.info(f"HuggingFace crawl complete: {stats}")
         return stats
@@ -197,8 +195,6 @@ class HuggingFaceSpider:
             self.session.commit()
         except Exception:
             self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
         return "new"
 
     def _process_space(self, space: dict) -> str:
@@ -243,8 +239,6 @@ class HuggingFaceSpider:
             self.session.commit()
         except Exception:
             self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
         return "new"
 
 
@@ -6,13 +6,19 @@ MCP servers are the most directly relevant agents for our index —
 they are tools designed to be discovered and used by other agents.
 """
 
-import time
+import asyncio
+import base64
+import json
 import logging
+import re
 from datetime import datetime
 from typing import Optional
 import httpx
-from agentindex.db.models import Agent, CrawlJob, get_session
+from agentindex.db.models import CrawlJob, EtagCache, get_session
+from agentindex.spiders.base import HTTP2, HTTP_LIMITS, AgentInsertMixin, bounded, fast_json
+from agentindex.spiders.http_cache import async_transport
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 logger = logging.getLogger("agentindex.spiders.mcp")
 
@@ -62,18 +68,52 @@ A2A_DISCOVERY_PATHS = [
     "/.well-known/agent-card.json",
 ]
 
+# github.com repo links inside a markdown document (scanned as raw bytes)
+GH_URL_RE = re.compile(rb"https://github\.com/[a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+")
+# owner and repo of a github.com repo link, ignoring any path/fragment/paren after it
+GH_REPO_RE = re.compile(r"^https://github\.com/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+?)(?:[/)#?].*)?$")
 
-class McpSpider:
+OFFICIAL_SERVER_URL = "https://github.com/modelcontextprotocol/servers/tree/main/src/{}"
+OFFICIAL_README_RAW_URL = "https://raw.githubusercontent.com/modelcontextprotocol/servers/main/src/{}/README.md"
+
+GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+SEARCH_INTERVAL = 2  # seconds between search API calls
+
+# Awesome-list repos are looked up up to 100 per GraphQL request (needs a token)
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 100
+GRAPHQL_REPO_FIELDS = (
+    "url nameWithOwner name description stargazerCount forkCount "
+    "owner { login } primaryLanguage { name } "
+    "repositoryTopics(first: 20) { nodes { topic { name } } }"
+)
+
+# Only readme[:10000] is stored; 20000 bytes covers that for any mostly-ASCII text
+README_RANGE = {"Range": "bytes=0-19999"}
+
+# Max per-repo / per-server detail fetches in flight at once
+MAX_CONCURRENCY = 8
+
+
+class McpSpider(AgentInsertMixin):
     """Crawls MCP registries and known server listings."""
 
+    SOURCE = "mcp"
+
     def __init__(self):
         import os
         token = os.getenv("GITHUB_TOKEN", "")
         headers = {"Accept": "application/vnd.github.v3+json"}
         if token:
             headers["Authorization"] = f"token {token}"
-        self.client = httpx.Client(timeout=30, headers=headers)
+        self.headers = headers
+        self.use_graphql = bool(token)  # GraphQL API rejects anonymous requests
+        self.client: Optional[httpx.AsyncClient] = None  # opened per crawl run
+        self._search_lock: Optional[asyncio.Lock] = None  # created per crawl run
+        self._etags: dict = {}          # url -> ETag from the last crawl
+        self._etag_updates: dict = {}   # url -> (etag, body) seen this crawl
         self.session = get_session()
+        self._seen: set = set()  # source_urls known to be indexed
         from sqlalchemy import text as _sa_text
         try:
             self.session.execute(_sa_text("SET LOCAL work_mem = '2MB'"))
@@ -82,58 +122,39 @@ class McpSpider:
             pass
 
     def crawl(self) -> dict:
+        """Synchronous entry point — runs acrawl() on its own event loop."""
+        return asyncio.run(self.acrawl())
+
+    async def acrawl(self) -> dict:
         stats = {"found": 0, "new": 0, "errors": 0}
+        started_at = datetime.utcnow()
 
-        # Crawl GitHub topic: mcp-server
-        try:
-            result = self._crawl_github_topic()
-            stats["found"] += result["found"]
-            stats["new"] += result["new"]
-            logger.info(f"MCP GitHub topic: found={result['found']}, new={result['new']}")
-        except Exception as e:
-            self.session.rollback()
-            logger.error(f"MCP GitHub topic error: {e}")
-            stats["errors"] += 1
+        self._load_etags()
+        self._load_seen()
 
-        # Crawl official MCP servers repo
-        try:
-            result = self._crawl_official_servers()
-            stats["found"] += result["found"]
-            stats["new"] += result["new"]
-            logger.info(f"MCP official servers: found={result['found']}, new={result['new']}")
-        except Exception as e:
-            logger.error(f"MCP official servers error: {e}")
-            stats["errors"] += 1
+        async with httpx.AsyncClient(
+            timeout=30, headers=self.headers, transport=async_transport(HTTP2, HTTP_LIMITS)
+        ) as client:
+            self.client = client
 
-        # Crawl awesome-mcp-servers
-        try:
-            result = self._crawl_awesome_list()
-            stats["found"] += result["found"]
-            stats["new"] += result["new"]
-            logger.info(f"MCP awesome list: found={result['found']}, new={result['new']}")
-        except Exception as e:
-            logger.error(f"MCP awesome list error: {e}")
-            stats["errors"] += 1
+            # The sub-crawls hit disjoint endpoints, so run them together;
+            # only the two search-API crawls share _search_lock pacing.
+            self._search_lock = asyncio.Lock()
+            results = await asyncio.gather(
+                *(crawl() for _, crawl in self._sub_crawls()), return_exceptions=True
+            )
 
-        # Extended keyword search for MCP servers
-        try:
-            result = self._crawl_extended_github_search()
-            stats["found"] += result["found"] 
-            stats["new"] += result["new"]
-            logger.info(f"Extended MCP search: found={result['found']}, new={result['new']}")
-        except Exception as e:
-            logger.error(f"Extended MCP search error: {e}")
-            stats["errors"] += 1
+        for (label, _), result in zip(self._sub_crawls(), results):
+            if isinstance(result, Exception):
+                self.session.rollback()
+                logger.error(f"{label} error: {result}")
+                stats["errors"] += 1
+            else:
+                stats["found"] += result["found"]
+                stats["new"] += result["new"]
+                logger.info(f"{label}: found={result['found']}, new={result['new']}")
 
-        # NPM MCP packages
-        try:
-            result = self._crawl_npm_mcp()
-            stats["found"] += result["found"]
-            stats["new"] += result["new"] 
-            logger.info(f"NPM MCP packages: found={result['found']}, new={result['new']}")
-        except Exception as e:
-            logger.error(f"NPM MCP packages error: {e}")
-            stats["errors"] += 1
+        self._flush_etags()
 
         job = CrawlJob(
             source="mcp",
@@ -141,7 +162,7 @@ class McpSpider:
             status="completed",
             items_found=stats["found"],
             items_new=stats["new"],
-            started_at=datetime.utcnow(),
+            started_at=started_at,
             completed_at=datetime.utcnow(),
         )
         self.session.add(job)
@@ -149,207 +170,320 @@ class McpSpider:
             self.session.commit()
         except Exception:
             self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
 
         logger.info(f"MCP crawl complete: {stats}")
         return stats
 
-    def _crawl_github_topic(self) -> dict:
+    def _sub_crawls(self) -> tuple:
+        """(log label, coroutine function) for each source acrawl() covers."""
+        return (
+            ("MCP GitHub topic", self._crawl_github_topic),
+            ("MCP official servers", self._crawl_official_servers),
+            ("MCP awesome list", self._crawl_awesome_list),
+            ("Extended MCP search", self._crawl_extended_github_search),
+            ("NPM MCP packages", self._crawl_npm_mcp),
+        )
+
+    async def _search_repos(self, params: dict) -> httpx.Response:
+        """
+        GET /search/repositories, spaced SEARCH_INTERVAL apart across all
+        concurrently running sub-crawls (the search API allows 30/min).
+        """
+        async with self._search_lock:
+            response = await self._get_conditional(GITHUB_SEARCH_URL, params=params)
+            await asyncio.sleep(SEARCH_INTERVAL)
+        return response
+
+    async def _crawl_github_topic(self) -> dict:
         """Crawl repos tagged with mcp-server topic."""
         stats = {"found": 0, "new": 0}
 
         page = 1
         while page <= 10:  # max 1000 results
-            response = self.client.get(
-                "https://api.github.com/search/repositories",
-                params={
-                    "q": "topic:mcp-server",
-                    "sort": "updated",
-                    "order": "desc",
-                    "per_page": 100,
-                    "page": page,
-                }
-            )
+            response = await self._search_repos({
+                "q": "topic:mcp-server",
+                "sort": "updated",
+                "order": "desc",
+                "per_page": 100,
+                "page": page,
+            })
 
             if response.status_code != 200:
                 break
 
-            data = response.json()
+            data = fast_json(response)
             items = data.get("items", [])
 
             if not items:
                 break
 
-            for repo in items:
-                stats["found"] += 1
-                result = self._process_github_repo(repo)
-                if result == "new":
-                    stats["new"] += 1
+            stats["found"] += len(items)
+            stats["new"] += self._insert_rows(self._github_rows(items))
 
             page += 1
-            time.sleep(2)
 
         return stats
 
-    def _crawl_official_servers(self) -> dict:
+    async def _crawl_official_servers(self) -> dict:
         """Crawl the official modelcontextprotocol/servers repo."""
         stats = {"found": 0, "new": 0}
 
-        response = self.client.get(
+        response = await self._get_conditional(
             "https://api.github.com/repos/modelcontextprotocol/servers/contents/src"
         )
 
         if response.status_code != 200:
             return stats
 
-        contents = response.json()
-
-        for item in contents:
-            if item.get("type") == "dir":
-                stats["found"] += 1
-                source_url = f"https://github.com/modelcontextprotocol/servers/tree/main/src/{item['name']}"
-
-                existing = self.session.execute(
-                    select(Agent).where(Agent.source_url == source_url)
-                ).scalar_one_or_none()
-
-                if not existing:
-                    # Get README from subdirectory
-                    readme = self._get_subdir_readme(item["name"])
-
-                    agent = Agent(
-                        source="mcp",
-                        source_url=source_url,
-                        source_id=f"mcp-official/{item['name']}",
-                        name=item["name"],
-                        description=f"Official MCP server: {item['name']}",
-                        author="modelcontextprotocol",
-                        protocols=["mcp"],
-                        invocation={"type": "mcp", "source": "official"},
-                        tags=["mcp", "official", "model-context-protocol"],
-                        raw_metadata={"readme": readme[:10000] if readme else None, "official": True},
-                        crawl_status="indexed",
-                        first_indexed=datetime.utcnow(),
-                        last_crawled=datetime.utcnow(),
-                    )
-                    self.session.add(agent)
-                    try:
-                        self.session.commit()
-                    except Exception:
-                        self.session.rollback()
-                        from agentindex.db.models import get_session
-                        self.session = get_session()
-                    stats["new"] += 1
+        contents = fast_json(response)
+        dirs = [item for item in contents if item.get("type") == "dir"]
+        stats["found"] += len(dirs)
+        existing = self._existing_urls([OFFICIAL_SERVER_URL.format(item["name"]) for item in dirs])
+        dirs = [item for item in dirs if OFFICIAL_SERVER_URL.format(item["name"]) not in existing]
+
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
+        results = await asyncio.gather(
+            *(bounded(sem, self._process_official_server(item["name"])) for item in dirs),
+            return_exceptions=True,
+        )
+        rows = []
+        for item, result in zip(dirs, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing official server {item['name']}: {result}")
+            elif result is not None:
+                rows.append(result)
+        stats["new"] += self._insert_rows(rows)
 
         return stats
 
-    def _crawl_awesome_list(self) -> dict:
+    async def _process_official_server(self, dirname: str) -> Optional[dict]:
+        """Build an agents row for one unindexed src/<dirname> official server."""
+        source_url = OFFICIAL_SERVER_URL.format(dirname)
+
+        # Get README from subdirectory
+        readme = await self._get_subdir_readme(dirname)
+
+        return {
+            "source": "mcp",
+            "source_url": source_url,
+            "source_id": f"mcp-official/{dirname}",
+            "name": dirname,
+            "description": f"Official MCP server: {dirname}",
+            "author": "modelcontextprotocol",
+            "protocols": ["mcp"],
+            "invocation": {"type": "mcp", "source": "official"},
+            "tags": ["mcp", "official", "model-context-protocol"],
+            "raw_metadata": {"readme": readme[:10000] if readme else None, "official": True},
+            "crawl_status": "indexed",
+        }
+
+    async def _crawl_awesome_list(self) -> dict:
         """Crawl awesome-mcp-servers for linked repos."""
         stats = {"found": 0, "new": 0}
 
-        response = self.client.get(
+        response = await self._get_conditional(
             "https://api.github.com/repos/punkpeye/awesome-mcp-servers/contents/README.md"
         )
 
         if response.status_code != 200:
             return stats
 
-        import base64
-        content = base64.b64decode(response.json().get("content", "")).decode("utf-8", errors="ignore")
+        # The links are ASCII, so scan the decoded bytes directly instead of
+        # UTF-8 decoding the whole (several hundred KB) list first
+        content = base64.b64decode(fast_json(response).get("content", ""))
 
         # Extract GitHub URLs from the awesome list
-        import re
-        github_urls = re.findall(r'https://github\.com/[a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+', content)
-        seen = set()
+        # url -> (owner, repo), deduped keeping list order
+        listed = {}
+        for link in GH_URL_RE.finditer(content):
+            url = link.group(0).decode("ascii")
+            m = GH_REPO_RE.match(url)
+            if m:
+                listed.setdefault(url, m.groups())
+        stats["found"] += len(listed)
+
+        existing = self._existing_urls(list(listed))
+        new_urls = [url for url in listed if url not in existing]
+
+        if self.use_graphql:
+            repos = await self._fetch_listed_repos_graphql([listed[url] for url in new_urls])
+            stats["new"] += self._insert_rows([self._process_github_repo(repo) for repo in repos])
+            return stats
 
-        for url in github_urls:
-            url = url.rstrip(")")  # clean trailing parens from markdown
-            if url in seen:
-                continue
-            seen.add(url)
+        # No token: fetch repo info for the unindexed ones over REST, concurrently
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
+        results = await asyncio.gather(
+            *(bounded(sem, self._fetch_listed_repo(*listed[url])) for url in new_urls),
+            return_exceptions=True,
+        )
+        rows = []
+        for url, result in zip(new_urls, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching {url}: {result}")
+            elif result is not None:
+                rows.append(result)
+        stats["new"] += self._insert_rows(rows)
 
-            stats["found"] += 1
+        return stats
 
-            existing = self.session.execute(
-                select(Agent).where(Agent.source_url == url)
-            ).scalar_one_or_none()
+    async def _fetch_listed_repos_graphql(self, pairs: list) -> list:
+        """
+        Look up (owner, repo) pairs GRAPHQL_BATCH_SIZE at a time, one aliased
+        repository() field per pair, and return them in the REST repo shape
+        _process_github_repo expects. Repos that no longer exist come back
+        null and are skipped.
+        """
+        repos = []
+        for start in range(0, len(pairs), GRAPHQL_BATCH_SIZE):
+            batch = pairs[start:start + GRAPHQL_BATCH_SIZE]
+            query = "query { %s }" % " ".join(
+                f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                f"{{ {GRAPHQL_REPO_FIELDS} }}"
+                for i, (owner, name) in enumerate(batch)
+            )
+            try:
+                response = await self.client.post(GRAPHQL_URL, json={"query": query})
+                if response.status_code != 200:
+                    logger.warning(f"GitHub GraphQL returned {response.status_code}")
+                    continue
+                data = fast_json(response).get("data") or {}
+            except Exception as e:
+                logger.error(f"GitHub GraphQL error: {e}")
+                continue
 
-            if not existing:
-                # Fetch repo info
-                parts = url.replace("https://github.com/", "").split("/")
-                if len(parts) >= 2:
-                    try:
-                        repo_response = self.client.get(
-                            f"https://api.github.com/repos/{parts[0]}/{parts[1]}"
-                        )
-                        if repo_response.status_code == 200:
-                            repo = repo_response.json()
-                            result = self._process_github_repo(repo)
-                            if result == "new":
-                                stats["new"] += 1
-                        time.sleep(0.5)
-                    except Exception as e:
-                        logger.error(f"Error fetching {url}: {e}")
+            for node in data.values():
+                if not node:
+                    continue
+                topics = [t["topic"]["name"] for t in node["repositoryTopics"]["nodes"]]
+                repos.append({
+                    "html_url": node["url"],
+                    "full_name": node["nameWithOwner"],
+                    "name": node["name"],
+                    "description": node["description"],
+                    "owner": node["owner"],
+                    "language": (node["primaryLanguage"] or {}).get("name"),
+                    "stargazers_count": node["stargazerCount"],
+                    "forks_count": node["forkCount"],
+                    "topics": topics,
+                })
+        return repos
+
+    async def _fetch_listed_repo(self, owner: str, repo: str) -> Optional[dict]:
+        """Fetch a repo linked from an awesome list and build its agents row."""
+        repo_response = await self._get_conditional(
+            f"https://api.github.com/repos/{owner}/{repo}"
+        )
+        if repo_response.status_code != 200:
+            return None
+        return self._process_github_repo(fast_json(repo_response))
 
-        return stats
+    def _load_etags(self):
+        """Load the ETags stored by previous crawls (bodies are read only on a 304)."""
+        try:
+            self._etags = dict(self.session.execute(select(EtagCache.url, EtagCache.etag)).all())
+        except Exception as e:
+            self.session.rollback()
+            logger.warning(f"Could not load ETag cache: {e}")
+            self._etags = {}
+
+    def _flush_etags(self):
+        """Upsert the ETags and bodies collected this crawl in one statement."""
+        if not self._etag_updates:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {"url": url, "etag": etag, "body": body, "fetched_at": now}
+            for url, (etag, body) in self._etag_updates.items()
+        ]
+        stmt = pg_insert(EtagCache).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["url"],
+            set_={"etag": stmt.excluded.etag, "body": stmt.excluded.body,
+                  "fetched_at": stmt.excluded.fetched_at},
+        )
+        try:
+            self.session.execute(stmt)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error saving {len(rows)} ETags: {e}")
+        self._etag_updates.clear()
+
+    async def _get_conditional(self, url: str, params: Optional[dict] = None) -> httpx.Response:
+        """
+        GET a GitHub API URL with If-None-Match from the previous crawl.
+        A 304 is answered from the stored body as a regular 200 response,
+        so callers don't need to know whether the cache was hit.
+        """
+        key = str(httpx.URL(url, params=params))
+        etag = self._etags.get(key)
+        headers = {"If-None-Match": etag} if etag else None
+        response = await self.client.get(url, params=params, headers=headers)
+
+        if response.status_code == 304:
+            body = self.session.execute(
+                select(EtagCache.body).where(EtagCache.url == key)
+            ).scalar_one_or_none()
+            if body is not None:
+                return httpx.Response(200, content=body, request=response.request)
+            # Cache row vanished between load and use — fetch unconditionally
+            response = await self.client.get(url, params=params)
+
+        new_etag = response.headers.get("ETag")
+        if response.status_code == 200 and new_etag:
+            self._etag_updates[key] = (new_etag, response.content)
+        return response
+
+    def _github_rows(self, items: list) -> list:
+        """Build agents rows for the repos in one search page that aren't indexed yet."""
+        existing = self._existing_urls([repo.get("html_url", "") for repo in items])
+        return [
+            self._process_github_repo(repo) for repo in items
+            if repo.get("html_url", "") not in existing
+        ]
 
-    def _process_github_repo(self, repo: dict) -> str:
-        """Process a GitHub repo dict (from API response)."""
+    def _process_github_repo(self, repo: dict) -> dict:
+        """Build an agents row from a GitHub repo dict (API response)."""
         source_url = repo.get("html_url", "")
 
-        existing = self.session.execute(
-            select(Agent).where(Agent.source_url == source_url)
-        ).scalar_one_or_none()
-
-        if existing:
-            return "skipped"
-
-        agent = Agent(
-            source="mcp",
-            source_url=source_url,
-            source_id=repo.get("full_name"),
-            name=repo.get("name", ""),
-            description=repo.get("description", ""),
-            author=repo.get("owner", {}).get("login"),
-            language=repo.get("language"),
-            stars=repo.get("stargazers_count", 0),
-            forks=repo.get("forks_count", 0),
-            protocols=["mcp"],
-            invocation={"type": "mcp"},
-            tags=repo.get("topics", []),
-            raw_metadata={
+        return {
+            "source": "mcp",
+            "source_url": source_url,
+            "source_id": repo.get("full_name"),
+            "name": repo.get("name", ""),
+            "description": repo.get("description", ""),
+            "author": repo.get("owner", {}).get("login"),
+            "language": repo.get("language"),
+            "stars": repo.get("stargazers_count", 0),
+            "forks": repo.get("forks_count", 0),
+            "protocols": ["mcp"],
+            "invocation": {"type": "mcp"},
+            "tags": repo.get("topics", []),
+            "raw_metadata": {
                 "full_name": repo.get("full_name"),
                 "description": repo.get("description"),
                 "topics": repo.get("topics", []),
             },
-            crawl_status="indexed",
-            first_indexed=datetime.utcnow(),
-            last_crawled=datetime.utcnow(),
-        )
-
-        self.session.add(agent)
-        try:
-            self.session.commit()
-        except Exception:
-            self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
-        return "new"
-
-    def _get_subdir_readme(self, dirname: str) -> Optional[str]:
+            "crawl_status": "indexed",
+        }
+
+    async def _get_subdir_readme(self, dirname: str) -> Optional[str]:
+        """
+        First README_RANGE bytes of an official server's README, straight
+        from raw.githubusercontent.com — no base64 JSON envelope and no
+        API rate-limit cost. A cut multi-byte char at the end is dropped.
+        """
         try:
-            response = self.client.get(
-                f"https://api.github.com/repos/modelcontextprotocol/servers/contents/src/{dirname}/README.md"
+            response = await self.client.get(
+                OFFICIAL_README_RAW_URL.format(dirname), headers=README_RANGE
             )
-            if response.status_code == 200:
-                import base64
-                return base64.b64decode(response.json().get("content", "")).decode("utf-8", errors="ignore")
+            if response.status_code in (200, 206):
+                return response.content.decode("utf-8", errors="ignore")
         except Exception:
             pass
         return None
 
-    def _crawl_extended_github_search(self) -> dict:
+    async def _crawl_extended_github_search(self) -> dict:
         """Extended GitHub search for MCP-related repos."""
         stats = {"found": 0, "new": 0}
 
@@ -364,88 +498,73 @@ class McpSpider:
 
         for term in search_terms:
             try:
-                response = self.client.get(
-                    "https://api.github.com/search/repositories",
-                    params={
-                        "q": term,
-                        "sort": "updated", 
-                        "order": "desc",
-                        "per_page": 50
-                    }
-                )
+                response = await self._search_repos({
+                    "q": term,
+                    "sort": "updated",
+                    "order": "desc",
+                    "per_page": 50,
+                })
 
                 if response.status_code == 200:
-                    data = response.json()
-                    for repo in data.get("items", []):
-                        stats["found"] += 1
-                        result = self._process_github_repo(repo)
-                        if result == "new":
-                            stats["new"] += 1
-
-                time.sleep(2)  # Rate limiting
-                
+                    data = fast_json(response)
+                    items = data.get("items", [])
+                    stats["found"] += len(items)
+                    stats["new"] += self._insert_rows(self._github_rows(items))
+
             except Exception as e:
                 logger.error(f"Extended search error for '{term}': {e}")
 
         return stats
 
-    def _crawl_npm_mcp(self) -> dict:
+    async def _crawl_npm_mcp(self) -> dict:
         """Crawl NPM for MCP server packages."""
         stats = {"found": 0, "new": 0}
 
         try:
             # NPM registry search
-            response = self.client.get(
+            response = await self.client.get(
                 "https://registry.npmjs.org/-/search?text=mcp%20server&size=100"
             )
 
             if response.status_code == 200:
-                data = response.json()
-                for pkg in data.get("objects", []):
+                data = fast_json(response)
+                objects = data.get("objects", [])
+                stats["found"] += len(objects)
+                existing = self._existing_urls([
+                    f"https://www.npmjs.com/package/{pkg.get('package', {}).get('name')}"
+                    for pkg in objects
+                ])
+                rows = []
+                for pkg in objects:
                     package = pkg.get("package", {})
-                    stats["found"] += 1
 
                     # Create agent entry for NPM package
                     source_url = f"https://www.npmjs.com/package/{package.get('name')}"
-                    
-                    existing = self.session.execute(
-                        select(Agent).where(Agent.source_url == source_url)
-                    ).scalar_one_or_none()
 
-                    if not existing:
+                    if source_url not in existing:
                         # Get GitHub repo from package if available
                         links = package.get("links", {})
                         github_url = links.get("repository") or links.get("homepage", "")
 
-                        agent = Agent(
-                            source="mcp",
-                            source_url=source_url,
-                            source_id=f"npm/{package.get('name')}",
-                            name=package.get("name", ""),
-                            description=package.get("description", ""),
-                            author=package.get("publisher", {}).get("username"),
-                            version=package.get("version"),
-                            protocols=["mcp"],
-                            invocation={"type": "mcp", "package_manager": "npm"},
-                            tags=package.get("keywords", []) + ["npm", "mcp"],
-                            raw_metadata={
+                        rows.append({
+                            "source": "mcp",
+                            "source_url": source_url,
+                            "source_id": f"npm/{package.get('name')}",
+                            "name": package.get("name", ""),
+                            "description": package.get("description", ""),
+                            "author": package.get("publisher", {}).get("username"),
+                            "protocols": ["mcp"],
+                            "invocation": {"type": "mcp", "package_manager": "npm"},
+                            "tags": package.get("keywords", []) + ["npm", "mcp"],
+                            "raw_metadata": {
                                 "npm_data": package,
                                 "github_url": github_url,
                                 "package_manager": "npm"
                             },
-                            crawl_status="indexed",
-                            first_indexed=datetime.utcnow(),
-                            last_crawled=datetime.utcnow(),
-                        )
-
-                        self.session.add(agent)
-                        try:
-                            self.session.commit()
-                        except Exception:
-                            self.session.rollback()
-                            from agentindex.db.models import get_session
-                            self.session = get_session()
-                        stats["new"] += 1
+                            "crawl_status": "indexed",
+                        })
+
+                stats["new"] += self._insert_rows(rows)
 
         except Exception as e:
             logger.error(f"NPM crawl error: {e}")
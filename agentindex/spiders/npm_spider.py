@@ -5,13 +5,14 @@ Crawls the npm registry for AI agent packages.
 npm has a public API that requires no authentication.
 """
 
-import time
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional
 import httpx
-from agentindex.db.models import Agent, CrawlJob, get_session
-from sqlalchemy import select
+from agentindex.db.models import CrawlJob, get_session
+from agentindex.spiders.base import HTTP2, HTTP_LIMITS, AgentInsertMixin, bounded, fast_json, KeywordDetector
+from agentindex.spiders.http_cache import async_transport
 
 logger = logging.getLogger("agentindex.spiders.npm")
 
@@ -42,32 +43,68 @@ SEARCH_QUERIES = [
 NPM_SEARCH_URL = "https://registry.npmjs.org/-/v1/search"
 NPM_PACKAGE_URL = "https://registry.npmjs.org"
 
+# (label, keywords) — a label applies if any of its keywords occurs in the text
+FRAMEWORK_KEYWORDS = (
+    ("langchain", ("langchain",)),
+    ("crewai", ("crewai",)),
+    ("openai", ("openai",)),
+    ("anthropic", ("anthropic",)),
+    ("mcp", ("mcp", "model-context-protocol")),
+)
+PROTOCOL_KEYWORDS = (
+    ("mcp", ("mcp",)),
+    ("a2a", ("a2a", "agent2agent")),
+    ("rest", ("rest", "api")),
+)
+_detect = KeywordDetector(FRAMEWORK_KEYWORDS, PROTOCOL_KEYWORDS)
 
-class NpmSpider:
+# Max per-package detail fetches in flight at once
+MAX_CONCURRENCY = 8
+
+
+def _package_url(name: str) -> str:
+    return f"https://www.npmjs.com/package/{name}"
+
+
+class NpmSpider(AgentInsertMixin):
     """Crawls npm registry for AI agent packages."""
 
+    SOURCE = "npm"
+
     def __init__(self):
-        self.client = httpx.Client(timeout=30)
+        self.client: Optional[httpx.AsyncClient] = None  # opened per crawl run
         self.session = get_session()
+        self._seen: set = set()  # source_urls known to be indexed
 
     def crawl(self, max_results_per_query: int = 250) -> dict:
+        """Synchronous entry point — runs acrawl() on its own event loop."""
+        return asyncio.run(self.acrawl(max_results_per_query))
+
+    async def acrawl(self, max_results_per_query: int = 250) -> dict:
         stats = {"queries_run": 0, "packages_found": 0, "new": 0, "updated": 0, "errors": 0}
+        started_at = datetime.utcnow()
 
-        for query in SEARCH_QUERIES:
-            try:
-                query_stats = self._crawl_query(query, max_results_per_query)
-                stats["queries_run"] += 1
-                stats["packages_found"] += query_stats["found"]
-                stats["new"] += query_stats["new"]
-                stats["updated"] += query_stats["updated"]
+        self._load_seen()
 
-                logger.info(f"npm query '{query}': found={query_stats['found']}, new={query_stats['new']}")
-                time.sleep(1)  # respectful pause
+        async with httpx.AsyncClient(
+            timeout=30, transport=async_transport(HTTP2, HTTP_LIMITS)
+        ) as client:
+            self.client = client
+            for query in SEARCH_QUERIES:
+                try:
+                    query_stats = await self._crawl_query(query, max_results_per_query)
+                    stats["queries_run"] += 1
+                    stats["packages_found"] += query_stats["found"]
+                    stats["new"] += query_stats["new"]
+                    stats["updated"] += query_stats["updated"]
 
-            except Exception as e:
-                self.session.rollback()
-                logger.error(f"Error crawling npm query '{query}': {e}")
-                stats["errors"] += 1
+                    logger.info(f"npm query '{query}': found={query_stats['found']}, new={query_stats['new']}")
+                    await asyncio.sleep(1)  # respectful pause
+
+                except Exception as e:
+                    self.session.rollback()
+                    logger.error(f"Error crawling npm query '{query}': {e}")
+                    stats["errors"] += 1
 
         job = CrawlJob(
             source="npm",
@@ -76,7 +113,7 @@ class NpmSpider:
             items_found=stats["packages_found"],
             items_new=stats["new"],
             items_updated=stats["updated"],
-            started_at=datetime.utcnow(),
+            started_at=started_at,
             completed_at=datetime.utcnow(),
         )
         self.session.add(job)
@@ -84,19 +121,18 @@ class NpmSpider:
             self.session.commit()
         except Exception:
             self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
 
         logger.info(f"npm crawl complete: {stats}")
         return stats
 
-    def _crawl_query(self, query: str, max_results: int) -> dict:
+    async def _crawl_query(self, query: str, max_results: int) -> dict:
         stats = {"found": 0, "new": 0, "updated": 0}
         offset = 0
         page_size = 250  # npm max
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
 
         while offset < max_results:
-            response = self.client.get(
+            response = await self.client.get(
                 NPM_SEARCH_URL,
                 params={
                     "text": query,
@@ -109,22 +145,31 @@ class NpmSpider:
                 logger.warning(f"npm search returned {response.status_code}")
                 break
 
-            data = response.json()
+            data = fast_json(response)
             objects = data.get("objects", [])
 
             if not objects:
                 break
 
-            for obj in objects:
-                stats["found"] += 1
-                try:
-                    result = self._process_package(obj)
-                    if result == "new":
-                        stats["new"] += 1
-                    elif result == "updated":
-                        stats["updated"] += 1
-                except Exception as e:
-                    logger.error(f"Error processing npm package: {e}")
+            stats["found"] += len(objects)
+            existing = self._existing_urls(
+                [_package_url(obj.get("package", {}).get("name", "")) for obj in objects]
+            )
+            fresh = [
+                obj for obj in objects
+                if _package_url(obj.get("package", {}).get("name", "")) not in existing
+            ]
+            results = await asyncio.gather(
+                *(bounded(sem, self._process_package(obj)) for obj in fresh),
+                return_exceptions=True,
+            )
+            rows = []
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error processing npm package: {result}")
+                elif result is not None:
+                    rows.append(result)
+            stats["new"] += self._insert_rows(rows)
 
             offset += len(objects)
 
@@ -133,20 +178,17 @@ class NpmSpider:
 
         return stats
 
-    def _process_package(self, obj: dict) -> str:
+    async def _process_package(self, obj: dict) -> Optional[dict]:
+        """Build a new agents row for a search result not yet indexed."""
         package = obj.get("package", {})
         name = package.get("name", "")
-        source_url = f"https://www.npmjs.com/package/{name}"
+        source_url = _package_url(name)
 
-        existing = self.session.execute(
-            select(Agent).where(Agent.source_url == source_url)
-        ).scalar_one_or_none()
-
-        if existing:
-            return "skipped"
-
-        # Get full package details
-        readme = self._get_readme(name)
+        # Full package details and the download count (popularity signal)
+        # live on different hosts, so fetch them concurrently
+        readme, downloads = await asyncio.gather(
+            self._get_readme(name), self._get_weekly_downloads(name)
+        )
 
         # Extract metadata
         links = package.get("links", {})
@@ -163,73 +205,46 @@ class NpmSpider:
         }
 
         # Detect frameworks and protocols
-        text_blob = " ".join([
-            package.get("description") or "",
-            " ".join(package.get("keywords") or []),
-            readme[:3000] if readme else "",
-        ]).lower()
-
-        frameworks = []
-        if "langchain" in text_blob: frameworks.append("langchain")
-        if "crewai" in text_blob: frameworks.append("crewai")
-        if "openai" in text_blob: frameworks.append("openai")
-        if "anthropic" in text_blob: frameworks.append("anthropic")
-        if "mcp" in text_blob or "model-context-protocol" in text_blob: frameworks.append("mcp")
-
-        protocols = []
-        if "mcp" in text_blob: protocols.append("mcp")
-        if "a2a" in text_blob or "agent2agent" in text_blob: protocols.append("a2a")
-        if "rest" in text_blob or "api" in text_blob: protocols.append("rest")
-
-        agent = Agent(
-            source="npm",
-            source_url=source_url,
-            source_id=name,
-            name=name,
-            description=package.get("description", ""),
-            author=publisher.get("username"),
-            language="JavaScript",
-            frameworks=frameworks,
-            protocols=protocols,
-            invocation={"type": "npm", "install": f"npm install {name}"},
-            tags=package.get("keywords", []),
-            raw_metadata=raw_metadata,
-            crawl_status="indexed",
-            first_indexed=datetime.utcnow(),
-            last_crawled=datetime.utcnow(),
-        )
-
-        # Try to get download count as popularity signal
-        downloads = self._get_weekly_downloads(name)
-        if downloads:
-            agent.downloads = downloads
-
-        self.session.add(agent)
-        try:
-            self.session.commit()
-        except Exception:
-            self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
-        return "new"
+        frameworks, protocols = _detect((
+            (package.get("description") or "").lower(),
+            " ".join(package.get("keywords") or []).lower(),
+            readme[:3000].lower() if readme else "",
+        ))
+
+        return {
+            "source": "npm",
+            "source_url": source_url,
+            "source_id": name,
+            "name": name,
+            "description": package.get("description", ""),
+            "author": publisher.get("username"),
+            "language": "JavaScript",
+            "downloads": downloads or 0,
+            "frameworks": frameworks,
+            "protocols": protocols,
+            "invocation": {"type": "npm", "install": f"npm install {name}"},
+            "tags": package.get("keywords", []),
+            "raw_metadata": raw_metadata,
+            "crawl_status": "indexed",
+        }
 
-    def _get_readme(self, package_name: str) -> Optional[str]:
+    async def _get_readme(self, package_name: str) -> Optional[str]:
         try:
-            response = self.client.get(f"{NPM_PACKAGE_URL}/{package_name}")
+            response = await self.client.get(f"{NPM_PACKAGE_URL}/{package_name}")
             if response.status_code == 200:
-                data = response.json()
+                data = fast_json(response)
                 return data.get("readme", "")
         except Exception:
             pass
         return None
 
-    def _get_weekly_downloads(self, package_name: str) -> Optional[int]:
+    async def _get_weekly_downloads(self, package_name: str) -> Optional[int]:
         try:
-            response = self.client.get(
+            response = await self.client.get(
                 f"https://api.npmjs.org/downloads/point/last-week/{package_name}"
             )
             if response.status_code == 200:
-                return response.json().get("downloads", 0)
+                return fast_json(response).get("downloads", 0)
         except Exception:
             pass
         return None
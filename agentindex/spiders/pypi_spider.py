@@ -5,13 +5,16 @@ Crawls PyPI (Python Package Index) for AI agent packages.
 Uses the public JSON API — no authentication needed.
 """
 
-import time
+import asyncio
 import logging
+import os
+import time
 from datetime import datetime
 from typing import Optional
 import httpx
-from agentindex.db.models import Agent, CrawlJob, get_session
-from sqlalchemy import select
+from agentindex.db.models import CrawlJob, get_session
+from agentindex.spiders.base import HTTP2, HTTP_LIMITS, AgentInsertMixin, bounded, fast_json, json_loads, KeywordDetector
+from agentindex.spiders.http_cache import async_transport
 
 logger = logging.getLogger("agentindex.spiders.pypi")
 
@@ -38,34 +41,79 @@ SEARCH_QUERIES = [
     "model context protocol",
 ]
 
-PYPI_SEARCH_URL = "https://pypi.org/search/"
+# PEP 691 JSON form of the simple index: every project name (~25 MB of JSON
+# for 600k+ projects). Kept on disk between crawls: a copy younger than
+# PYPI_INDEX_MAX_AGE is reused as is, an older one is revalidated by ETag.
+PYPI_SIMPLE_URL = "https://pypi.org/simple/"
+PYPI_SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+PYPI_INDEX_CACHE_DIR = os.path.expanduser(os.getenv("PYPI_INDEX_CACHE_DIR", "~/.agentindex/pypi"))
+PYPI_INDEX_MAX_AGE = int(os.getenv("PYPI_INDEX_MAX_AGE", str(6 * 3600)))  # seconds
 PYPI_JSON_URL = "https://pypi.org/pypi"
 
+# (label, keywords) — a label applies if any of its keywords occurs in the text
+FRAMEWORK_KEYWORDS = (
+    ("langchain", ("langchain",)),
+    ("crewai", ("crewai",)),
+    ("autogen", ("autogen",)),
+    ("openai", ("openai",)),
+    ("anthropic", ("anthropic",)),
+    ("mcp", ("mcp",)),
+    ("llamaindex", ("llamaindex",)),
+)
+PROTOCOL_KEYWORDS = (
+    ("mcp", ("mcp",)),
+    ("a2a", ("a2a",)),
+    ("rest", ("rest", "api")),
+)
+_detect = KeywordDetector(FRAMEWORK_KEYWORDS, PROTOCOL_KEYWORDS)
+
+# Max per-package JSON API fetches in flight at once
+MAX_CONCURRENCY = 8
+
+
+def _project_url(name: str) -> str:
+    return f"https://pypi.org/project/{name}/"
 
-class PypiSpider:
+
+class PypiSpider(AgentInsertMixin):
     """Crawls PyPI for AI agent packages."""
 
+    SOURCE = "pypi"
+
     def __init__(self):
-        self.client = httpx.Client(timeout=30)
+        self.client: Optional[httpx.AsyncClient] = None  # opened per crawl run
         self.session = get_session()
+        self._seen: set = set()  # source_urls known to be indexed
+        self._projects: list = []  # (match key, name), most recently updated first
 
     def crawl(self, max_results_per_query: int = 100) -> dict:
+        """Synchronous entry point — runs acrawl() on its own event loop."""
+        return asyncio.run(self.acrawl(max_results_per_query))
+
+    async def acrawl(self, max_results_per_query: int = 100) -> dict:
         stats = {"queries_run": 0, "packages_found": 0, "new": 0, "updated": 0, "errors": 0}
+        started_at = datetime.utcnow()
 
-        for query in SEARCH_QUERIES:
-            try:
-                query_stats = self._crawl_query(query, max_results_per_query)
-                stats["queries_run"] += 1
-                stats["packages_found"] += query_stats["found"]
-                stats["new"] += query_stats["new"]
+        self._load_seen()
 
-                logger.info(f"PyPI query '{query}': found={query_stats['found']}, new={query_stats['new']}")
-                time.sleep(2)
+        async with httpx.AsyncClient(
+            timeout=30, transport=async_transport(HTTP2, HTTP_LIMITS)
+        ) as client:
+            self.client = client
+            self._projects = await self._load_project_index()
+            for query in SEARCH_QUERIES:
+                try:
+                    query_stats = await self._crawl_query(query, max_results_per_query)
+                    stats["queries_run"] += 1
+                    stats["packages_found"] += query_stats["found"]
+                    stats["new"] += query_stats["new"]
 
-            except Exception as e:
-                self.session.rollback()
-                logger.error(f"Error crawling PyPI query '{query}': {e}")
-                stats["errors"] += 1
+                    logger.info(f"PyPI query '{query}': found={query_stats['found']}, new={query_stats['new']}")
+
+                except Exception as e:
+                    self.session.rollback()
+                    logger.error(f"Error crawling PyPI query '{query}': {e}")
+                    stats["errors"] += 1
 
         job = CrawlJob(
             source="pypi",
@@ -73,7 +121,7 @@ class PypiSpider:
             status="completed",
             items_found=stats["packages_found"],
             items_new=stats["new"],
-            started_at=datetime.utcnow(),
+            started_at=started_at,
             completed_at=datetime.utcnow(),
         )
         self.session.add(job)
@@ -81,81 +129,126 @@ class PypiSpider:
             self.session.commit()
         except Exception:
             self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
 
         logger.info(f"PyPI crawl complete: {stats}")
         return stats
 
-    def _crawl_query(self, query: str, max_results: int) -> dict:
+    async def _load_project_index(self) -> list:
         """
-        PyPI doesn't have a great search API. We use the JSON API
-        to look up specific packages and the simple search page for discovery.
-        Strategy: search for packages, then fetch full details via JSON API.
+        Load every project name from the simple index (JSON form) once.
+        Returns (match key, name) pairs, most recently updated first, where
+        the match key is "-" + the normalized name so a query word can be
+        matched at the start of any dash-separated token.
         """
-        stats = {"found": 0, "new": 0}
-
-        # Use PyPI simple search (HTML scraping as fallback)
-        # Primary approach: use the XML-RPC or search endpoint
+        body = await self._fetch_project_index()
+        if body is None:
+            return []
         try:
-            response = self.client.get(
-                PYPI_SEARCH_URL,
-                params={"q": query, "page": 1},
-                headers={"Accept": "text/html"},
-                follow_redirects=True,
-            )
-
-            if response.status_code != 200:
-                return stats
-
-            # Extract package names from search results
-            # Simple parsing — look for package name patterns
-            text = response.text
-            package_names = self._extract_package_names(text)
-
-            for name in package_names[:max_results]:
-                stats["found"] += 1
-                try:
-                    result = self._process_package(name)
-                    if result == "new":
-                        stats["new"] += 1
-                except Exception as e:
-                    logger.error(f"Error processing PyPI package {name}: {e}")
+            projects = json_loads(body).get("projects", [])
+        except Exception as e:
+            logger.error(f"PyPI simple index is not valid JSON: {e}")
+            return []
+
+        projects.sort(key=lambda p: p.get("_last-serial", 0), reverse=True)
+        return [
+            ("-" + p["name"].lower().replace("_", "-").replace(".", "-"), p["name"])
+            for p in projects
+        ]
 
-                time.sleep(0.5)
+    async def _fetch_project_index(self) -> Optional[bytes]:
+        """
+        Raw simple index body, from the on-disk copy when it is fresh or the
+        server answers 304, otherwise downloaded and saved. A stale copy is
+        still used if the download fails. None if there is nothing to use.
+        """
+        body_path = os.path.join(PYPI_INDEX_CACHE_DIR, "simple.json")
+        etag_path = os.path.join(PYPI_INDEX_CACHE_DIR, "simple.etag")
+        cached = None
+        etag = None
+        try:
+            with open(body_path, "rb") as f:
+                cached = f.read()
+            if time.time() - os.path.getmtime(body_path) < PYPI_INDEX_MAX_AGE:
+                return cached
+            with open(etag_path) as f:
+                etag = f.read().strip() or None
+        except OSError:
+            pass
 
+        headers = {"Accept": PYPI_SIMPLE_JSON}
+        if cached is not None and etag:
+            headers["If-None-Match"] = etag
+        try:
+            response = await self.client.get(PYPI_SIMPLE_URL, headers=headers, timeout=120)
         except Exception as e:
-            logger.error(f"PyPI search error: {e}")
+            logger.error(f"PyPI simple index error: {e}")
+            return cached
 
-        return stats
+        if response.status_code == 304 and cached is not None:
+            os.utime(body_path)  # fresh again for PYPI_INDEX_MAX_AGE
+            return cached
+        if response.status_code != 200:
+            logger.error(f"PyPI simple index returned {response.status_code}")
+            return cached
 
-    def _extract_package_names(self, html: str) -> list:
-        """Extract package names from PyPI search results HTML."""
+        body = response.content
+        try:
+            os.makedirs(PYPI_INDEX_CACHE_DIR, exist_ok=True)
+            with open(body_path + ".tmp", "wb") as f:
+                f.write(body)
+            os.replace(body_path + ".tmp", body_path)
+            with open(etag_path, "w") as f:
+                f.write(response.headers.get("ETag", ""))
+        except OSError as e:
+            logger.warning(f"Could not cache the PyPI simple index: {e}")
+        return body
+
+    def _match_projects(self, query: str, max_results: int) -> list:
+        """Names whose tokens start with every word of the query, newest first."""
+        words = ["-" + word for word in query.lower().split()]
         names = []
-        # Look for package links: /project/PACKAGE_NAME/
-        import re
-        matches = re.findall(r'/project/([^/]+)/', html)
-        seen = set()
-        for name in matches:
-            if name not in seen and name not in ("", "help", "account"):
-                seen.add(name)
+        for key, name in self._projects:
+            if all(word in key for word in words):
                 names.append(name)
+                if len(names) >= max_results:
+                    break
         return names
 
-    def _process_package(self, name: str) -> str:
-        source_url = f"https://pypi.org/project/{name}/"
+    async def _crawl_query(self, query: str, max_results: int) -> dict:
+        """
+        PyPI has no search API. Discovery matches the query against the
+        project names from the simple index, then full details come from
+        the per-package JSON API.
+        """
+        stats = {"found": 0, "new": 0}
 
-        existing = self.session.execute(
-            select(Agent).where(Agent.source_url == source_url)
-        ).scalar_one_or_none()
+        names = self._match_projects(query, max_results)
+        stats["found"] += len(names)
+        existing = self._existing_urls([_project_url(name) for name in names])
+        names = [name for name in names if _project_url(name) not in existing]
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
+        results = await asyncio.gather(
+            *(bounded(sem, self._process_package(name)) for name in names),
+            return_exceptions=True,
+        )
+        rows = []
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing PyPI package {name}: {result}")
+            elif result is not None:
+                rows.append(result)
+        stats["new"] += self._insert_rows(rows)
 
-        if existing:
-            return "skipped"
+        return stats
+
+    async def _process_package(self, name: str) -> Optional[dict]:
+        """Build a new agents row for an unindexed package, or None if unavailable."""
+        source_url = _project_url(name)
 
         # Get full package info via JSON API
-        package_data = self._get_package_info(name)
+        package_data = await self._get_package_info(name)
         if not package_data:
-            return "skipped"
+            return None
 
         info = package_data.get("info", {})
 
@@ -175,25 +268,11 @@ class PypiSpider:
         tags = [k.strip() for k in keywords.replace(",", " ").split() if k.strip()]
 
         # Detect frameworks
-        text_blob = " ".join([
-            info.get("summary") or "",
-            info.get("description") or "",
-            keywords,
-        ]).lower()
-
-        frameworks = []
-        if "langchain" in text_blob: frameworks.append("langchain")
-        if "crewai" in text_blob: frameworks.append("crewai")
-        if "autogen" in text_blob: frameworks.append("autogen")
-        if "openai" in text_blob: frameworks.append("openai")
-        if "anthropic" in text_blob: frameworks.append("anthropic")
-        if "mcp" in text_blob: frameworks.append("mcp")
-        if "llamaindex" in text_blob: frameworks.append("llamaindex")
-
-        protocols = []
-        if "mcp" in text_blob: protocols.append("mcp")
-        if "a2a" in text_blob: protocols.append("a2a")
-        if "rest" in text_blob or "api" in text_blob: protocols.append("rest")
+        frameworks, protocols = _detect((
+            (info.get("summary") or "").lower(),
+            (info.get("description") or "").lower(),
+            keywords.lower(),
+        ))
 
         # Find GitHub repo URL
         github_url = None
@@ -205,39 +284,28 @@ class PypiSpider:
         if not github_url and info.get("home_page") and "github.com" in (info.get("home_page") or ""):
             github_url = info["home_page"]
 
-        agent = Agent(
-            source="pypi",
-            source_url=source_url,
-            source_id=name,
-            name=name,
-            description=info.get("summary", ""),
-            author=info.get("author") or info.get("maintainer"),
-            license=info.get("license"),
-            language="Python",
-            frameworks=frameworks,
-            protocols=protocols,
-            invocation={"type": "pip", "install": f"pip install {name}"},
-            tags=tags,
-            raw_metadata=raw_metadata,
-            crawl_status="indexed",
-            first_indexed=datetime.utcnow(),
-            last_crawled=datetime.utcnow(),
-        )
-
-        self.session.add(agent)
-        try:
-            self.session.commit()
-        except Exception:
-            self.session.rollback()
-            from agentindex.db.models import get_session
-            self.session = get_session()
-        return "new"
+        return {
+            "source": "pypi",
+            "source_url": source_url,
+            "source_id": name,
+            "name": name,
+            "description": info.get("summary", ""),
+            "author": info.get("author") or info.get("maintainer"),
+            "license": info.get("license"),
+            "language": "Python",
+            "frameworks": frameworks,
+            "protocols": protocols,
+            "invocation": {"type": "pip", "install": f"pip install {name}"},
+            "tags": tags,
+            "raw_metadata": raw_metadata,
+            "crawl_status": "indexed",
+        }
 
-    def _get_package_info(self, name: str) -> Optional[dict]:
+    async def _get_package_info(self, name: str) -> Optional[dict]:
         try:
-            response = self.client.get(f"{PYPI_JSON_URL}/{name}/json")
+            response = await self.client.get(f"{PYPI_JSON_URL}/{name}/json")
             if response.status_code == 200:
-                return response.json()
+                return fast_json(response)
         except Exception:
             pass
         return None
@@ -2,7 +2,7 @@
 AgentIndex Installation Verification
 
 Run after installation to verify every component works.
-Usage: python -m agentindex.verify
+Usage: python -m agentindex.verify [--no-cache]
 
 Checks:
 1. Python dependencies
@@ -14,11 +14,29 @@ Checks:
 7. Parser can initialize
 8. API starts
 9. End-to-end: insert test agent, query it, delete it
+
+Independent checks run concurrently; results print in the order above.
+Checks 6, 7 and 9 need the database and are skipped if section 2 fails.
+
+Set AGENTINDEX_VERIFY_ONLY to a comma-separated list of section keys to run
+just those sections, e.g. AGENTINDEX_VERIFY_ONLY=postgres,redis,e2e.
+Keys: deps, postgres, redis, ollama, github, spiders, agents, api, e2e.
+Modules used only by unselected sections are never imported.
+
+Results of checks that did not fail are remembered in
+~/.agentindex/verify_cache.json for 60s and replayed, marked cached, on a rerun
+within that window; --no-cache runs them all.
 """
 
+import functools
+import importlib
+import importlib.util
+import json
 import sys
 import os
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Colors for terminal output
 GREEN = "\033[92m"
@@ -32,24 +50,399 @@ WARN = f"{YELLOW}⚠{RESET}"
 errors = []
 warnings = []
 
+# Checks block on sockets (Postgres, Redis, Ollama, GitHub), so threads overlap them
+MAX_WORKERS = 8
+
+CACHE_PATH = os.path.expanduser("~/.agentindex/verify_cache.json")
+CACHE_TTL = 60  # seconds a non-failing result is trusted without rerunning the check
+
+
+@functools.lru_cache(maxsize=None)
+def _module(name: str):
+    """Import a module the first time a check needs it; later checks reuse it."""
+    return importlib.import_module(name)
 
-def check(name: str, func):
-    """Run a check and print result."""
+
+class Warn(str):
+    """Returned by a check that passed with a caveat worth a warning."""
+
+
+def run_check(func) -> tuple:
+    """
+    Run a check. Returns (status, detail), status being "ok", "warn" or
+    "error". A check returns True, a detail to show next to ✓ (e.g. a
+    version), or a Warn; raising marks it failed.
+    """
     try:
         result = func()
-        if result is True:
-            print(f"  {CHECK} {name}")
-        elif isinstance(result, str):
-            print(f"  {WARN} {name}: {result}")
-            warnings.append(f"{name}: {result}")
-        else:
-            print(f"  {CHECK} {name}: {result}")
     except Exception as e:
-        print(f"  {CROSS} {name}: {e}")
-        errors.append(f"{name}: {e}")
+        return "error", str(e)
+    if result is True:
+        return "ok", None
+    if isinstance(result, Warn):
+        return "warn", str(result)
+    return "ok", result
+
+
+def report(name: str, status: str, detail):
+    """Print a check result and record it in errors/warnings."""
+    if status == "error":
+        print(f"  {CROSS} {name}: {detail}")
+        errors.append(f"{name}: {detail}")
+    elif status == "warn":
+        print(f"  {WARN} {name}: {detail}")
+        warnings.append(f"{name}: {detail}")
+    elif detail is None:
+        print(f"  {CHECK} {name}")
+    else:
+        print(f"  {CHECK} {name}: {detail}")
+
+
+def _load_cache() -> dict:
+    """Non-failing results from recent runs: {"section/check": {"ts", "status", "detail"}}."""
+    try:
+        with open(CACHE_PATH) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    now = time.time()
+    return {k: v for k, v in cache.items() if now - v.get("ts", 0) < CACHE_TTL}
+
+
+def _save_cache(cache: dict):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # the cache is only a shortcut
+
+
+def _resolved(value) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+# 1. Dependencies
+
+def check_fastapi():
+    return f"v{_module('fastapi').__version__}"
+
+
+def check_sqlalchemy():
+    return f"v{_module('sqlalchemy').__version__}"
+
+
+def check_httpx():
+    return f"v{_module('httpx').__version__}"
+
+
+def check_ollama():
+    _module("ollama")
+    return True
+
+
+def check_pydantic():
+    return f"v{_module('pydantic').__version__}"
+
+
+def check_apscheduler():
+    _module("apscheduler")
+    return True
+
+
+def check_redis_lib():
+    _module("redis")
+    return True
+
+
+def check_github():
+    # Only the spider needs PyGithub; locate it without importing the package
+    if importlib.util.find_spec("github") is None:
+        raise ModuleNotFoundError("No module named 'github'")
+    return True
+
+
+# 2. PostgreSQL
+
+def check_postgres():
+    # Same pooled engine that init_db()/get_session() use below, so the
+    # schema and end-to-end checks reuse this connection.
+    from sqlalchemy import text
+    from agentindex.db.models import get_engine
+    engine = get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(text("SELECT 1")).scalar()
+        assert result == 1
+    return engine.url.database
+
+
+def check_schema():
+    from agentindex.db.models import init_db, get_session, Agent
+    from sqlalchemy import select, func
+    init_db()
+    session = get_session()
+    count = session.execute(select(func.count(Agent.id))).scalar()
+    session.close()
+    return f"OK ({count} agents in database)"
+
+
+# 3. Redis
+
+@functools.lru_cache(maxsize=None)
+def _redis_client():
+    """Redis client shared by the Redis checks."""
+    redis = _module("redis")
+    url = os.getenv("REDIS_URL", "redis://localhost:6379")
+    return redis.Redis.from_url(url, socket_connect_timeout=2, socket_timeout=2)
+
+
+def check_redis():
+    # PING and INFO in one round trip
+    pipe = _redis_client().pipeline()
+    pipe.ping()
+    pipe.info("server")
+    ok, info = pipe.execute()
+    assert ok
+    return f"{info['redis_version']} up"
+
+
+# 4. Ollama
+
+_ollama_models_cache = {}
+_ollama_lock = threading.Lock()
 
 
-def main():
+@functools.lru_cache(maxsize=None)
+def _ollama_client():
+    from ollama import Client
+    return Client(host=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"))
+
+
+def _ollama_model_names() -> list:
+    """Installed model names, listed once and shared by the Ollama checks."""
+    with _ollama_lock:
+        if "names" not in _ollama_models_cache:
+            models = _ollama_client().list()
+            _ollama_models_cache["names"] = [m.get("name", "") for m in models.get("models", [])]
+    return _ollama_models_cache["names"]
+
+
+def check_ollama_server():
+    names = _ollama_model_names()
+    return f"{len(names)} models: {', '.join(names[:5])}"
+
+
+def check_7b_model():
+    model = os.getenv("OLLAMA_MODEL_SMALL", "qwen2.5:7b")
+    response = _ollama_client().chat(
+        model=model,
+        messages=[{"role": "user", "content": "Respond with exactly: OK"}],
+        options={"temperature": 0},
+    )
+    text = response["message"]["content"].strip()
+    if "OK" in text:
+        return f"{model} responding"
+    return Warn(f"{model} responded but unexpected: {text[:50]}")
+
+
+def check_72b_model():
+    model = os.getenv("OLLAMA_MODEL_LARGE", "qwen2.5:7b")
+    if any(model in n for n in _ollama_model_names()):
+        return f"{model} available"
+    if model == os.getenv("OLLAMA_MODEL_SMALL", "qwen2.5:7b"):
+        return Warn(f"Large model same as small ({model}) — OK for 16GB machine")
+    return Warn(f"{model} not found — classifier will use fallback")
+
+
+# 5. GitHub Token
+
+def check_github_token():
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        return Warn("GITHUB_TOKEN not set — GitHub spider will fail")
+    httpx = _module("httpx")
+    resp = httpx.get(
+        "https://api.github.com/rate_limit",
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=5,
+    )
+    resp.raise_for_status()
+    core = resp.json()["resources"]["core"]
+    return f"Token valid, {core['remaining']}/{core['limit']} requests remaining"
+
+
+# 6. Spiders
+
+def check_github_spider():
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        return Warn("Skipped (no token)")
+    _module("agentindex.spiders.github_spider").GitHubSpider()
+    return True
+
+
+def check_npm_spider():
+    _module("agentindex.spiders.npm_spider").NpmSpider()
+    return True
+
+
+def check_pypi_spider():
+    _module("agentindex.spiders.pypi_spider").PypiSpider()
+    return True
+
+
+def check_hf_spider():
+    _module("agentindex.spiders.huggingface_spider").HuggingFaceSpider()
+    return True
+
+
+def check_mcp_spider():
+    _module("agentindex.spiders.mcp_spider").McpSpider()
+    return True
+
+
+# 7. Agents
+
+def check_parser():
+    _module("agentindex.agents.parser").Parser()
+    return True
+
+
+def check_classifier():
+    classifier = _module("agentindex.agents.classifier").Classifier()
+    return f"Using model: {classifier.model}"
+
+
+def check_ranker():
+    _module("agentindex.agents.ranker").Ranker()
+    return True
+
+
+def check_missionary():
+    _module("agentindex.agents.missionary").Missionary()
+    return True
+
+
+# 8. API
+
+def check_api():
+    app = _module("agentindex.api.discovery").app
+    # Verify routes exist
+    routes = [r.path for r in app.routes]
+    expected = ["/v1/health", "/v1/discover", "/v1/stats"]
+    for e in expected:
+        assert e in routes, f"Missing route: {e}"
+    return f"{len(routes)} routes registered"
+
+
+# 9. End-to-end test
+
+def check_e2e():
+    from agentindex.db.models import Agent, get_session
+    from sqlalchemy import select
+    import uuid
+
+    session = get_session()
+
+    # Insert test agent
+    test_id = uuid.uuid4()
+    test_agent = Agent(
+        id=test_id,
+        source="test",
+        source_url=f"https://test.example.com/{test_id}",
+        source_id="test-agent",
+        name="test-verify-agent",
+        description="Temporary agent for verification",
+        capabilities=["testing", "verification"],
+        category="other",
+        quality_score=0.5,
+        crawl_status="ranked",
+        is_active=True,
+    )
+    # One transaction: flush the insert, read it back, delete it, commit once
+    try:
+        with session.begin():
+            session.add(test_agent)
+            session.flush()
+
+            # Verify it exists
+            found = session.execute(
+                select(Agent).where(Agent.id == test_id)
+            ).scalar_one_or_none()
+            assert found is not None, "Test agent not found after insert"
+            assert found.name == "test-verify-agent"
+
+            # Clean up
+            session.delete(found)
+    finally:
+        session.close()
+
+    return "Insert → Query → Delete OK"
+
+
+def _dispose_engine():
+    """Close the pooled DB connections, if any check opened them."""
+    models = sys.modules.get("agentindex.db.models")
+    if models is not None and models._engine is not None:
+        models._engine.dispose()
+
+
+# (key, title, sections that must have passed, [(check name, check)]).
+# Checks import what they exercise only when they run, so a section that is
+# skipped never pays for importing its modules.
+SECTIONS = [
+    ("deps", "1. Python Dependencies", (), [
+        ("FastAPI", check_fastapi),
+        ("SQLAlchemy", check_sqlalchemy),
+        ("httpx", check_httpx),
+        ("ollama", check_ollama),
+        ("pydantic", check_pydantic),
+        ("APScheduler", check_apscheduler),
+        ("redis", check_redis_lib),
+        ("PyGithub", check_github),
+    ]),
+    ("postgres", "2. PostgreSQL", (), [
+        ("Connection", check_postgres),
+        ("Schema", check_schema),
+    ]),
+    ("redis", "3. Redis", (), [
+        ("Connection", check_redis),
+    ]),
+    ("ollama", "4. Ollama & Models", (), [
+        ("Ollama server", check_ollama_server),
+        ("7B model", check_7b_model),
+        ("Large model", check_72b_model),
+    ]),
+    ("github", "5. GitHub API", (), [
+        ("Token & rate limit", check_github_token),
+    ]),
+    ("spiders", "6. Spiders (initialization)", ("postgres",), [
+        ("GitHub spider", check_github_spider),
+        ("npm spider", check_npm_spider),
+        ("PyPI spider", check_pypi_spider),
+        ("HuggingFace spider", check_hf_spider),
+        ("MCP spider", check_mcp_spider),
+    ]),
+    ("agents", "7. Agents (initialization)", ("postgres",), [
+        ("Parser", check_parser),
+        ("Classifier", check_classifier),
+        ("Ranker", check_ranker),
+        ("Missionary", check_missionary),
+    ]),
+    ("api", "8. Discovery API", (), [
+        ("Routes", check_api),
+    ]),
+    ("e2e", "9. End-to-End Test", ("postgres",), [
+        ("Database round-trip", check_e2e),
+    ]),
+]
+
+
+def main(argv=None):
+    use_cache = "--no-cache" not in (sys.argv[1:] if argv is None else argv)
+
     print("\n" + "=" * 50)
     print("AgentIndex Installation Verification")
     print("=" * 50)
@@ -57,257 +450,65 @@ def main():
     from dotenv import load_dotenv
     load_dotenv()
 
-    # 1. Dependencies
-    print("\n1. Python Dependencies")
-
-    def check_fastapi():
-        import fastapi
-        return f"v{fastapi.__version__}"
-    check("FastAPI", check_fastapi)
-
-    def check_sqlalchemy():
-        import sqlalchemy
-        return f"v{sqlalchemy.__version__}"
-    check("SQLAlchemy", check_sqlalchemy)
-
-    def check_httpx():
-        import httpx
-        return f"v{httpx.__version__}"
-    check("httpx", check_httpx)
-
-    def check_ollama():
-        import ollama
-        return True
-    check("ollama", check_ollama)
-
-    def check_pydantic():
-        import pydantic
-        return f"v{pydantic.__version__}"
-    check("pydantic", check_pydantic)
-
-    def check_apscheduler():
-        import apscheduler
-        return True
-    check("APScheduler", check_apscheduler)
-
-    def check_redis_lib():
-        import redis
-        return True
-    check("redis", check_redis_lib)
-
-    def check_github():
-        from github import Github
-        return True
-    check("PyGithub", check_github)
-
-    # 2. PostgreSQL
-    print("\n2. PostgreSQL")
-
-    def check_postgres():
-        from sqlalchemy import create_engine, text
-        from agentindex.db_config import get_read_dsn
-        url = os.getenv("DATABASE_URL") or get_read_dsn()
-        engine = create_engine(url)
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1")).scalar()
-            assert result == 1
-        return url.split("/")[-1]
-    check("Connection", check_postgres)
-
-    def check_schema():
-        from agentindex.db.models import init_db, get_session, Agent
-        from sqlalchemy import select, func
-        init_db()
-        session = get_session()
-        count = session.execute(select(func.count(Agent.id))).scalar()
-        session.close()
-        return f"OK ({count} agents in database)"
-    check("Schema", check_schema)
-
-    # 3. Redis
-    print("\n3. Redis")
-
-    def check_redis():
-        import redis
-        url = os.getenv("REDIS_URL", "redis://localhost:6379")
-        r = redis.from_url(url)
-        assert r.ping()
-        return True
-    check("Connection", check_redis)
-
-    # 4. Ollama
-    print("\n4. Ollama & Models")
-
-    def check_ollama_server():
-        from ollama import Client
-        url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        client = Client(host=url)
-        models = client.list()
-        names = [m.get("name", "") for m in models.get("models", [])]
-        return f"{len(names)} models: {', '.join(names[:5])}"
-    check("Ollama server", check_ollama_server)
-
-    def check_7b_model():
-        from ollama import Client
-        url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        model = os.getenv("OLLAMA_MODEL_SMALL", "qwen2.5:7b")
-        client = Client(host=url)
-        response = client.chat(
-            model=model,
-            messages=[{"role": "user", "content": "Respond with exactly: OK"}],
-            options={"temperature": 0},
-        )
-        text = response["message"]["content"].strip()
-        if "OK" in text:
-            return f"{model} responding"
-        return f"{model} responded but unexpected: {text[:50]}"
-    check("7B model", check_7b_model)
-
-    def check_72b_model():
-        from ollama import Client
-        url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        model = os.getenv("OLLAMA_MODEL_LARGE", "qwen2.5:7b")
-        client = Client(host=url)
-        models = client.list()
-        names = [m.get("name", "") for m in models.get("models", [])]
-        if any(model in n for n in names):
-            return f"{model} available"
-        if model == os.getenv("OLLAMA_MODEL_SMALL", "qwen2.5:7b"):
-            return f"Large model same as small ({model}) — OK for 16GB machine"
-        return f"{model} not found — classifier will use fallback"
-    check("Large model", check_72b_model)
-
-    # 5. GitHub Token
-    print("\n5. GitHub API")
-
-    def check_github_token():
-        token = os.getenv("GITHUB_TOKEN")
-        if not token:
-            return "GITHUB_TOKEN not set — GitHub spider will fail"
-        from github import Github
-        g = Github(token)
-        rate = g.get_rate_limit()
-        return f"Token valid, {rate.core.remaining}/{rate.core.limit} requests remaining"
-    check("Token & rate limit", check_github_token)
-
-    # 6. Spiders
-    print("\n6. Spiders (initialization)")
-
-    def check_github_spider():
-        token = os.getenv("GITHUB_TOKEN")
-        if not token:
-            return "Skipped (no token)"
-        from agentindex.spiders.github_spider import GitHubSpider
-        spider = GitHubSpider()
-        return True
-    check("GitHub spider", check_github_spider)
-
-    def check_npm_spider():
-        from agentindex.spiders.npm_spider import NpmSpider
-        spider = NpmSpider()
-        return True
-    check("npm spider", check_npm_spider)
-
-    def check_pypi_spider():
-        from agentindex.spiders.pypi_spider import PypiSpider
-        spider = PypiSpider()
-        return True
-    check("PyPI spider", check_pypi_spider)
-
-    def check_hf_spider():
-        from agentindex.spiders.huggingface_spider import HuggingFaceSpider
-        spider = HuggingFaceSpider()
-        return True
-    check("HuggingFace spider", check_hf_spider)
-
-    def check_mcp_spider():
-        from agentindex.spiders.mcp_spider import McpSpider
-        spider = McpSpider()
-        return True
-    check("MCP spider", check_mcp_spider)
-
-    # 7. Agents
-    print("\n7. Agents (initialization)")
-
-    def check_parser():
-        from agentindex.agents.parser import Parser
-        parser = Parser()
-        return True
-    check("Parser", check_parser)
-
-    def check_classifier():
-        from agentindex.agents.classifier import Classifier
-        classifier = Classifier()
-        return f"Using model: {classifier.model}"
-    check("Classifier", check_classifier)
-
-    def check_ranker():
-        from agentindex.agents.ranker import Ranker
-        ranker = Ranker()
-        return True
-    check("Ranker", check_ranker)
-
-    def check_missionary():
-        from agentindex.agents.missionary import Missionary
-        m = Missionary()
-        return True
-    check("Missionary", check_missionary)
-
-    # 8. API
-    print("\n8. Discovery API")
-
-    def check_api():
-        from agentindex.api.discovery import app
-        # Verify routes exist
-        routes = [r.path for r in app.routes]
-        expected = ["/v1/health", "/v1/discover", "/v1/stats"]
-        for e in expected:
-            assert e in routes, f"Missing route: {e}"
-        return f"{len(routes)} routes registered"
-    check("Routes", check_api)
-
-    # 9. End-to-end test
-    print("\n9. End-to-End Test")
-
-    def check_e2e():
-        from agentindex.db.models import Agent, get_session
-        from sqlalchemy import select
-        import uuid
-
-        session = get_session()
-
-        # Insert test agent
-        test_id = uuid.uuid4()
-        test_agent = Agent(
-            id=test_id,
-            source="test",
-            source_url=f"https://test.example.com/{test_id}",
-            source_id="test-agent",
-            name="test-verify-agent",
-            description="Temporary agent for verification",
-            capabilities=["testing", "verification"],
-            category="other",
-            quality_score=0.5,
-            crawl_status="ranked",
-            is_active=True,
-        )
-        session.add(test_agent)
-        session.commit()
-
-        # Verify it exists
-        found = session.execute(
-            select(Agent).where(Agent.id == test_id)
-        ).scalar_one_or_none()
-        assert found is not None, "Test agent not found after insert"
-        assert found.name == "test-verify-agent"
-
-        # Clean up
-        session.delete(found)
-        session.commit()
-        session.close()
-
-        return "Insert → Query → Delete OK"
-    check("Database round-trip", check_e2e)
+    only = set(filter(None, os.getenv("AGENTINDEX_VERIFY_ONLY", "").replace(" ", "").split(",")))
+    unknown = only - {key for key, _, _, _ in SECTIONS}
+    if unknown:
+        print(f"{RED}Unknown AGENTINDEX_VERIFY_ONLY sections: {', '.join(sorted(unknown))}{RESET}")
+        return 1
+    sections = [s for s in SECTIONS if not only or s[0] in only]
+    cache = _load_cache() if use_cache else {}
+
+    # Start every check as soon as the sections it requires have finished;
+    # sections without requirements go first so they run while others wait.
+    # Results are printed afterwards in section order.
+    submitted = {}  # section key -> [(check name, future of (status, detail))]
+    ran = set()  # "section/check" keys actually run (not skipped or cached)
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            for key, title, requires, checks in sorted(sections, key=lambda s: bool(s[2])):
+                # A required section that was not selected does not block
+                blocked = [
+                    r for r in requires
+                    if any(future.result()[0] == "error" for _, future in submitted.get(r, ()))
+                ]
+                if blocked:
+                    reason = f"Skipped ({', '.join(blocked)} checks failed)"
+                    submitted[key] = [(name, _resolved(("warn", reason))) for name, _ in checks]
+                else:
+                    submitted[key] = []
+                    for name, func in checks:
+                        cached = cache.get(f"{key}/{name}")
+                        if cached:
+                            detail = cached["detail"]
+                            future = _resolved((
+                                cached.get("status", "ok"),
+                                f"{detail} (cached)" if detail else "cached",
+                            ))
+                        else:
+                            future = pool.submit(run_check, func)
+                            ran.add(f"{key}/{name}")
+                        submitted[key].append((name, future))
+
+            for key, title, _, _ in sections:
+                print(f"\n{title}")
+                for name, future in submitted[key]:
+                    report(name, *future.result())
+    finally:
+        _dispose_engine()
+
+    # Remember every check that ran and did not fail, warnings included;
+    # entries served from the cache keep their original timestamp
+    now = time.time()
+    for key, title, _, checks in sections:
+        for name, future in submitted[key]:
+            status, detail = future.result()
+            if status != "error" and f"{key}/{name}" in ran:
+                cache[f"{key}/{name}"] = {
+                    "ts": now,
+                    "status": status,
+                    "detail": None if detail is None else str(detail),
+                }
+    _save_cache(cache)
 
     # Summary
     print("\n" + "=" * 50)
@@ -3,90 +3,140 @@ AgentIndex PR Monitor — Kör dagligen via cron
 Kollar status på alla öppna PRs, rapporterar ändringar,
 och lämnar uppföljningskommentar efter 7 dagar utan aktivitet.
 """
-import requests, json, os
+import asyncio, atexit, httpx, orjson, os
 from datetime import datetime, timedelta
+from dotenv import dotenv_values
 
-TOKEN = os.environ.get('GITHUB_TOKEN', '')
-if not TOKEN:
-    with open(os.path.join(os.path.dirname(__file__), '.env')) as f:
-        for line in f:
-            if line.startswith('GITHUB_TOKEN='):
-                TOKEN = line.strip().split('=', 1)[1]
+TOKEN = (
+    os.environ.get('GITHUB_TOKEN')
+    or dotenv_values(os.path.join(os.path.dirname(__file__), '.env')).get('GITHUB_TOKEN')
+    or ''
+)
 
 HEADERS = {'Authorization': f'token {TOKEN}', 'Accept': 'application/vnd.github.v3+json'}
 STATE_FILE = os.path.join(os.path.dirname(__file__), 'missionary_state.json')
 LOG_FILE = os.path.join(os.path.dirname(__file__), 'pr_monitor.log')
+GRAPHQL_URL = 'https://api.github.com/graphql'
+GRAPHQL_BATCH_SIZE = 100
+REST_CONCURRENCY = 5  # parallel REST fallbacks, kept low for GitHub's secondary rate limit
 
 FOLLOWUP_MSG = (
     "Hi! Just checking in on this PR. "
     "Happy to make any changes if needed. Thanks for maintaining this great list! 🙏"
 )
 
+# Opened once per run; buffered lines are flushed after the summary and on exit
+_logf = open(LOG_FILE, 'a', buffering=8192)
+atexit.register(_logf.close)
+
 def log(msg):
     ts = datetime.utcnow().strftime('%Y-%m-%d %H:%M')
     line = f'[{ts}] {msg}'
     print(line)
-    with open(LOG_FILE, 'a') as f:
-        f.write(line + '\n')
+    _logf.write(line + '\n')
 
-def check_prs():
-    with open(STATE_FILE) as f:
-        state = json.load(f)
-
-    changes = []
-    for repo, info in state.get('awesome_lists', {}).items():
-        if info.get('pr_status') != 'submitted':
+async def fetch_prs_graphql(client, tracked):
+    # One aliased pullRequest() per tracked PR, GRAPHQL_BATCH_SIZE per query.
+    # Returns {repo: pr} in the REST shape check_prs reads; PRs the query
+    # could not resolve are left out for the caller to fetch over REST.
+    prs = {}
+    for start in range(0, len(tracked), GRAPHQL_BATCH_SIZE):
+        batch = tracked[start:start + GRAPHQL_BATCH_SIZE]
+        fields = []
+        for i, (repo, pr_num) in enumerate(batch):
+            owner, _, name = repo.partition('/')
+            fields.append(
+                f'p{i}: repository(owner: {orjson.dumps(owner).decode()}, name: {orjson.dumps(name).decode()}) '
+                f'{{ pullRequest(number: {int(pr_num)}) {{ state merged createdAt }} }}'
+            )
+        try:
+            r = await client.post(GRAPHQL_URL, json={'query': 'query { %s }' % ' '.join(fields)})
+        except httpx.HTTPError as e:
+            log(f'WARN: GraphQL request failed: {e}')
             continue
-        pr_num = info.get('pr_number')
-        if not pr_num:
+        if not r.is_success:
+            log(f'WARN: GraphQL request failed: {r.status_code}')
             continue
+        data = r.json().get('data') or {}
+        for i, (repo, _) in enumerate(batch):
+            pr = (data.get(f'p{i}') or {}).get('pullRequest')
+            if pr:
+                prs[repo] = {
+                    'state': 'open' if pr['state'] == 'OPEN' else 'closed',
+                    'merged': pr['merged'],
+                    'created_at': pr['createdAt'],
+                }
+    return prs
 
-        r = requests.get(
-            f'https://api.github.com/repos/{repo}/pulls/{pr_num}',
-            headers=HEADERS, timeout=10
-        )
-        if not r.ok:
-            log(f'WARN: {repo} #{pr_num} fetch failed: {r.status_code}')
-            continue
+async def fetch_pr_rest(client, sem, repo, pr_num):
+    async with sem:
+        r = await client.get(f'https://api.github.com/repos/{repo}/pulls/{pr_num}')
+    if not r.is_success:
+        log(f'WARN: {repo} #{pr_num} fetch failed: {r.status_code}')
+        return None
+    return r.json()
 
-        pr = r.json()
-        gh_state = pr['state']
-        merged = pr.get('merged', False)
-        created = datetime.strptime(pr['created_at'][:10], '%Y-%m-%d')
-        age_days = (datetime.utcnow() - created).days
-
-        if merged:
-            log(f'MERGED: {repo} #{pr_num} !!!')
-            info['pr_status'] = 'merged'
-            changes.append(f'MERGED: {repo} #{pr_num}')
-        elif gh_state == 'closed':
-            log(f'CLOSED: {repo} #{pr_num}')
-            info['pr_status'] = 'closed'
-            changes.append(f'CLOSED: {repo} #{pr_num}')
-        elif age_days >= 7 and not info.get('followup_sent'):
-            log(f'FOLLOWUP: {repo} #{pr_num} (age: {age_days} days)')
-            r2 = requests.post(
-                f'https://api.github.com/repos/{repo}/issues/{pr_num}/comments',
-                headers=HEADERS,
-                json={'body': FOLLOWUP_MSG},
-                timeout=10
-            )
-            if r2.status_code in (200, 201):
-                info['followup_sent'] = True
-                log(f'  Comment posted OK')
-                changes.append(f'FOLLOWUP sent: {repo} #{pr_num}')
+async def check_prs():
+    with open(STATE_FILE, 'rb') as f:
+        state = orjson.loads(f.read())
+
+    tracked = [
+        (repo, info) for repo, info in state.get('awesome_lists', {}).items()
+        if info.get('pr_status') == 'submitted' and info.get('pr_number')
+    ]
+
+    changes = []
+    # One client for every PR: connections (HTTP/2) are reused across requests
+    async with httpx.AsyncClient(http2=True, headers=HEADERS, timeout=10) as client:
+        prs = await fetch_prs_graphql(client, [(repo, info['pr_number']) for repo, info in tracked])
+        missing = [(repo, info['pr_number']) for repo, info in tracked if repo not in prs]
+        if missing:
+            sem = asyncio.Semaphore(REST_CONCURRENCY)
+            fetched = await asyncio.gather(*(fetch_pr_rest(client, sem, *pr) for pr in missing))
+            prs.update((repo, pr) for (repo, _), pr in zip(missing, fetched) if pr is not None)
+
+        for repo, info in tracked:
+            pr_num = info['pr_number']
+            pr = prs.get(repo)
+            if pr is None:
+                continue
+
+            gh_state = pr['state']
+            merged = pr.get('merged', False)
+            created = datetime.strptime(pr['created_at'][:10], '%Y-%m-%d')
+            age_days = (datetime.utcnow() - created).days
+
+            if merged:
+                log(f'MERGED: {repo} #{pr_num} !!!')
+                info['pr_status'] = 'merged'
+                changes.append(f'MERGED: {repo} #{pr_num}')
+            elif gh_state == 'closed':
+                log(f'CLOSED: {repo} #{pr_num}')
+                info['pr_status'] = 'closed'
+                changes.append(f'CLOSED: {repo} #{pr_num}')
+            elif age_days >= 7 and not info.get('followup_sent'):
+                log(f'FOLLOWUP: {repo} #{pr_num} (age: {age_days} days)')
+                r2 = await client.post(
+                    f'https://api.github.com/repos/{repo}/issues/{pr_num}/comments',
+                    json={'body': FOLLOWUP_MSG},
+                )
+                if r2.status_code in (200, 201):
+                    info['followup_sent'] = True
+                    log(f'  Comment posted OK')
+                    changes.append(f'FOLLOWUP sent: {repo} #{pr_num}')
+                else:
+                    log(f'  Comment failed: {r2.status_code}')
             else:
-                log(f'  Comment failed: {r2.status_code}')
-        else:
-            log(f'OK: {repo} #{pr_num} ({gh_state}, {age_days}d old)')
+                log(f'OK: {repo} #{pr_num} ({gh_state}, {age_days}d old)')
 
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+    with open(STATE_FILE, 'wb') as f:
+        f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
 
     if changes:
         log(f'SUMMARY: {len(changes)} changes: {changes}')
     else:
         log('SUMMARY: No changes')
+    _logf.flush()
 
 if __name__ == '__main__':
-    check_prs()
+    asyncio.run(check_prs())
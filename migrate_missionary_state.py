@@ -3,7 +3,7 @@
 Migration script: Build initial missionary_state.json from existing data.
 """
 
-import json
+import orjson
 import os
 from datetime import datetime
 
@@ -12,8 +12,8 @@ BASE = os.path.expanduser("~/agentindex")
 def load_json(path):
     if os.path.exists(path):
         try:
-            with open(path) as f:
-                return json.load(f)
+            with open(path, "rb") as f:
+                return orjson.loads(f.read())
         except Exception as e:
             print(f"  Warning: Could not load {path}: {e}")
     return []
@@ -49,23 +49,6 @@ def main():
         "sickn33/antigravity-awesome-skills": {"name": "Antigravity Awesome Skills", "stars": 8700, "pr_status": "submitted"},
     }
 
-    for a in all_actions:
-        if a.get("type") == "add_awesome_list" and a.get("status") in ("executed", "approved", "done"):
-            repo = a.get("details", {}).get("repo", "")
-            if repo and repo not in awesome_lists:
-                awesome_lists[repo] = {
-                    "name": a.get("details", {}).get("name", repo.split("/")[-1]),
-                    "stars": a.get("details", {}).get("stars", 0),
-                    "pr_status": "not_submitted",
-                    "tracked_at": a.get("created", ""),
-                }
-                print(f"  + Awesome list from history: {repo}")
-
-    for repo, info in pr_state_repos.items():
-        if repo in awesome_lists:
-            if info.get("pr_url") or info.get("status") in ("submitted", "merged", "open"):
-                awesome_lists[repo]["pr_status"] = "submitted"
-
     registries = {
         "smithery": {"name": "Smithery", "url": "https://smithery.ai/server/agentidx/agentcrawl", "status": "listed"},
         "mcphub": {"name": "MCP Hub", "url": "https://mcphub.io", "status": "not_registered"},
@@ -75,38 +58,54 @@ def main():
         "composio": {"name": "Composio MCP", "url": "https://composio.dev/mcp", "status": "not_registered"},
     }
 
-    for a in all_actions:
-        if a.get("type") == "register_registry" and a.get("status") in ("executed",):
-            name = a.get("details", {}).get("name", "")
-            key = name.lower().replace(" ", "")
-            if key in registries:
-                result = a.get("result", "")
-                if "Issue created" in result:
-                    registries[key]["status"] = "pending"
-                    print(f"  + Registry from history: {key} -> pending")
-
-    terms_suggested = []
-    for a in all_actions:
-        if a.get("type") == "add_search_term":
-            term = a.get("details", {}).get("term", "")
-            if term and term not in terms_suggested:
-                terms_suggested.append(term)
+    # dicts as insertion-ordered sets: O(1) dedup, first-seen order kept
+    terms_suggested = {}
+    competitors_seen = {}
 
-    competitors_seen = []
+    # One pass over the actions, dispatching on type
     for a in all_actions:
-        if a.get("type") in ("new_competitor", "spy_new_competitor"):
-            url = a.get("details", {}).get("url", "")
+        action_type = a.get("type")
+        details = a.get("details", {})
+        if action_type == "add_awesome_list":
+            if a.get("status") not in ("executed", "approved", "done"):
+                continue
+            repo = details.get("repo", "")
+            if repo and repo not in awesome_lists:
+                awesome_lists[repo] = {
+                    "name": details.get("name", repo.split("/")[-1]),
+                    "stars": details.get("stars", 0),
+                    "pr_status": "not_submitted",
+                    "tracked_at": a.get("created", ""),
+                }
+                print(f"  + Awesome list from history: {repo}")
+        elif action_type == "register_registry":
+            if a.get("status") != "executed":
+                continue
+            key = details.get("name", "").lower().replace(" ", "")
+            if key in registries and "Issue created" in a.get("result", ""):
+                registries[key]["status"] = "pending"
+                print(f"  + Registry from history: {key} -> pending")
+        elif action_type == "add_search_term":
+            term = details.get("term", "")
+            if term:
+                terms_suggested[term] = None
+        elif action_type in ("new_competitor", "spy_new_competitor"):
+            url = details.get("url", "")
             if "github.com/" in url:
                 repo = "/".join(url.replace("https://github.com/", "").split("/")[:2])
-                if repo not in competitors_seen:
-                    competitors_seen.append(repo)
+                competitors_seen[repo] = None
+
+    for repo, info in pr_state_repos.items():
+        if repo in awesome_lists:
+            if info.get("pr_url") or info.get("status") in ("submitted", "merged", "open"):
+                awesome_lists[repo]["pr_status"] = "submitted"
 
     state = {
         "awesome_lists": awesome_lists,
         "registries": registries,
         "discovered_channels": {},
-        "search_terms_suggested": terms_suggested,
-        "competitors_seen": competitors_seen,
+        "search_terms_suggested": list(terms_suggested),
+        "competitors_seen": list(competitors_seen),
         "endpoints_alerted": {},
         "last_run": None,
         "migrated_at": datetime.utcnow().isoformat(),
@@ -118,8 +117,8 @@ def main():
     }
 
     state_path = os.path.join(BASE, "missionary_state.json")
-    with open(state_path, "w") as f:
-        json.dump(state, f, indent=2, default=str)
+    with open(state_path, "wb") as f:
+        f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
 
     print(f"\n=== State saved to {state_path} ===")
     print(f"  Awesome lists: {len(awesome_lists)}")
@@ -139,8 +138,8 @@ def main():
 
     if stale_count > 0:
         queue_path = os.path.join(BASE, "action_queue.json")
-        with open(queue_path, "w") as f:
-            json.dump(cleaned_queue, f, indent=2, default=str)
+        with open(queue_path, "wb") as f:
+            f.write(orjson.dumps(cleaned_queue, option=orjson.OPT_INDENT_2))
         print(f"  Cleaned {stale_count} stale auto/notify actions from queue")
 
 if __name__ == "__main__":
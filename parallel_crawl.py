@@ -119,7 +119,7 @@ class ParallelCrawler:
             return {'source': 'github', 'total_found': 0, 'error': str(e)}
     
     def run_npm_crawler(self) -> Dict:
-        """Run npm crawler (synchronous)."""
+        """Run npm crawler (synchronous; runs its own event loop)."""
         logger.info("📦 Starting npm crawler")
         try:
             from agentindex.spiders.npm_spider import NpmSpider
@@ -135,7 +135,7 @@ class ParallelCrawler:
             return {'source': 'npm', 'total_found': 0, 'error': str(e)}
     
     def run_mcp_crawler(self) -> Dict:
-        """Run MCP GitHub crawler (synchronous)."""
+        """Run MCP GitHub crawler (synchronous; runs its own event loop)."""
         logger.info("🔌 Starting MCP GitHub crawler")
         try:
             from agentindex.spiders.mcp_spider import McpSpider
@@ -167,7 +167,7 @@ class ParallelCrawler:
             return {'source': 'huggingface', 'total_found': 0, 'error': str(e)}
     
     def run_pypi_crawler(self) -> Dict:
-        """Run PyPI crawler (synchronous).""" 
+        """Run PyPI crawler (synchronous; runs its own event loop)."""
         logger.info("🐍 Starting PyPI crawler")
         try:
             from agentindex.spiders.pypi_spider import PypiSpider
@@ -211,44 +211,36 @@ class ParallelCrawler:
             else:
                 logger.warning(f"Unknown source: {source}")
         
-        # Run async crawlers concurrently
-        async_results = {}
-        if async_crawlers:
-            logger.info(f"Running {len(async_crawlers)} async crawlers...")
-            tasks = [crawler_func for _, crawler_func in async_crawlers]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for i, (source_name, _) in enumerate(async_crawlers):
-                result = results[i]
-                if isinstance(result, Exception):
-                    logger.error(f"Async crawler {source_name} failed: {result}")
-                    async_results[source_name] = {'source': source_name, 'total_found': 0, 'error': str(result)}
-                else:
-                    async_results[source_name] = result
-        
-        # Run sync crawlers in thread pool
-        sync_results = {}
-        if sync_crawlers:
-            logger.info(f"Running {len(sync_crawlers)} sync crawlers in thread pool...")
-            
-            with ThreadPoolExecutor(max_workers=min(len(sync_crawlers), 4)) as executor:
-                future_to_source = {
-                    executor.submit(crawler_func): source_name 
-                    for source_name, crawler_func in sync_crawlers
-                }
-                
-                for future in future_to_source:
-                    source_name = future_to_source[future]
-                    try:
-                        result = future.result(timeout=1800)  # 30 min timeout per crawler
-                        sync_results[source_name] = result
-                    except Exception as e:
-                        logger.error(f"Sync crawler {source_name} failed: {e}")
-                        sync_results[source_name] = {'source': source_name, 'total_found': 0, 'error': str(e)}
-        
-        # Combine results
-        all_results = {**async_results, **sync_results}
-        
+        # Run async crawlers on this loop and sync crawlers (npm, mcp and pypi
+        # included: their DB writes block, so they keep their own event loop
+        # in a worker thread) all at the same time, so the crawl takes as long
+        # as the slowest one
+        all_results = {}
+        loop = asyncio.get_running_loop()
+        logger.info(f"Running {len(async_crawlers)} async and {len(sync_crawlers)} sync crawlers...")
+
+        executor = ThreadPoolExecutor(max_workers=max(len(sync_crawlers), 1))
+        try:
+            crawlers = async_crawlers + [
+                # 30 min timeout per crawler
+                (source_name, asyncio.wait_for(loop.run_in_executor(executor, crawler_func), timeout=1800))
+                for source_name, crawler_func in sync_crawlers
+            ]
+            results = await asyncio.gather(*(task for _, task in crawlers), return_exceptions=True)
+        finally:
+            # A thread cannot be cancelled: don't wait for one that timed out,
+            # report it failed and let it finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for (source_name, _), result in zip(crawlers, results):
+            if isinstance(result, Exception):
+                # TimeoutError has an empty str(); keep the error field truthy
+                error = str(result) or type(result).__name__
+                logger.error(f"Crawler {source_name} failed: {error}")
+                all_results[source_name] = {'source': source_name, 'total_found': 0, 'error': error}
+            else:
+                all_results[source_name] = result
+
         end_time = time.time()
         duration = end_time - self.start_time
         
@@ -10,12 +10,26 @@ logger = logging.getLogger("parser_loop")
 from agentindex.agents.parser import Parser
 from agentindex.agents.mcp_compliance import McpComplianceClassifier
 
+MIN_BATCH, MAX_BATCH = 20, 200
+MIN_SLEEP, BUSY_SLEEP, IDLE_SLEEP = 0.5, 5, 60
+
 compliance_classifier = McpComplianceClassifier()
 
+# A full batch means the queue is deep: double the batch and barely pause.
+# A mostly empty one shrinks the batch and backs off towards IDLE_SLEEP;
+# a mostly failed one drops straight to MIN_BATCH and IDLE_SLEEP.
+batch_size = MIN_BATCH
+sleep_s = BUSY_SLEEP
+
+# One Parser (Ollama client + write session) for the life of the loop;
+# rebuilt only if its session cannot be rolled back after an error.
+p = None
+
 while True:
     try:
-        p = Parser()
-        stats = p.parse_pending(batch_size=20)
+        if p is None:
+            p = Parser()
+        stats = p.parse_pending(batch_size=batch_size)
         logger.info(f"Parse batch: {stats}")
         
         # Run MCP compliance classification after parsing
@@ -24,11 +38,30 @@ while True:
             logger.info(f"MCP Comply: {comp_stats['processed']} classified - "
                        f"High: {comp_stats['high_risk']}, Med: {comp_stats['medium_risk']}, Low: {comp_stats['low_risk']}")
         
-        if stats["parsed"] == 0 and stats["skipped"] == 0 and stats["errors"] == 0:
-            logger.info("Nothing to parse, sleeping 60s")
-            time.sleep(60)
+        # Failed rows stay 'indexed' and come back next batch, so errors are
+        # not progress; when they dominate (e.g. Ollama down) back off fully.
+        handled = stats["parsed"] + stats["skipped"]
+        if stats["errors"] > handled:
+            batch_size = MIN_BATCH
+            sleep_s = IDLE_SLEEP
+            logger.warning(f"Mostly errors, sleeping {sleep_s:.0f}s")
+        elif handled >= batch_size:
+            batch_size = min(batch_size * 2, MAX_BATCH)
+            sleep_s = MIN_SLEEP
+        elif handled < batch_size // 4:
+            batch_size = max(batch_size // 2, MIN_BATCH)
+            sleep_s = min(max(sleep_s, BUSY_SLEEP) * 2, IDLE_SLEEP)
         else:
-            time.sleep(5)
+            sleep_s = BUSY_SLEEP
+
+        if handled == 0 and not stats["errors"]:
+            logger.info(f"Nothing to parse, sleeping {sleep_s:.0f}s")
+        time.sleep(sleep_s)
     except Exception as e:
         logger.error(f"Parser error: {e}")
+        if p is not None:
+            try:
+                p.session.rollback()
+            except Exception:
+                p = None
         time.sleep(30)
@@ -16,38 +16,138 @@ Usage:
 
     # Index stats
     info = stats()
+
+    # Many needs at once (results in input order)
+    batches = batch_discover(["contract review", "code review"])
+
+    # From async code; aclose() before the event loop ends
+    results = await adiscover("contract review")
+    batches = await abatch_discover(["contract review", "code review"])
+    await aclose()
 """
 
+import asyncio
 import httpx
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pip install agentcrawl[fast]
+    import json
+    _loads = json.loads
+
 __version__ = "0.3.1"
 
 # Will be updated when domain is decided
 DEFAULT_ENDPOINT = "https://api.agentcrawl.dev/v1"
 
 _client = None
+# event loop -> (AsyncClient, _config_version it was built for)
+_async_clients = weakref.WeakKeyDictionary()
+_config_version = 0  # bumped by configure() so async clients get rebuilt
+_client_lock = threading.Lock()  # the warm-up thread races the first call
 _api_key = None
 
+# One origin, so a single HTTP/2 connection multiplexes concurrent calls
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60)
+_ASYNC_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60)
+BATCH_CONCURRENCY = 10  # in-flight discover calls per batch
+
 
-def configure(endpoint: str = None, api_key: str = None):
-    """Configure the SDK."""
-    global DEFAULT_ENDPOINT, _api_key, _client
+def configure(endpoint: str = None, api_key: str = None, warm_up: bool = False):
+    """
+    Configure the SDK.
+
+    Pass warm_up=True to send a background HEAD /health that resolves DNS
+    and opens the connection, so the first real call skips the handshake.
+    Off by default: it makes a network request as a side effect.
+    """
+    global DEFAULT_ENDPOINT, _api_key, _client, _config_version
     if endpoint:
         DEFAULT_ENDPOINT = endpoint.rstrip("/")
     if api_key:
         _api_key = api_key
-    _client = None  # reset client
+    # Swap in new clients on the next call rather than closing the old ones,
+    # which other threads or coroutines may still be using; they are closed
+    # when garbage-collected
+    with _client_lock:
+        _client = None
+        _config_version += 1
+    if warm_up:
+        threading.Thread(target=_warm_up, daemon=True).start()
+
+
+def _warm_up():
+    try:
+        _get_client().head(f"{DEFAULT_ENDPOINT}/health")
+    except Exception:
+        pass  # best effort; the first real call connects as usual
+
+
+def _headers() -> dict:
+    headers = {"Content-Type": "application/json"}
+    if _api_key:
+        headers["Authorization"] = f"Bearer {_api_key}"
+    return headers
 
 
 def _get_client() -> httpx.Client:
+    """Shared pooled client; safe to use from several threads."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(timeout=30, headers=_headers(), http2=True, limits=_LIMITS)
+        return _client
+
+
+def close():
+    """
+    Close the shared sync client; the next call opens a new one. Only call
+    it once no other thread is using the SDK.
+    """
     global _client
-    if _client is None:
-        headers = {"Content-Type": "application/json"}
-        if _api_key:
-            headers["Authorization"] = f"Bearer {_api_key}"
-        _client = httpx.Client(timeout=30, headers=headers)
-    return _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Shared async client for adiscover/abatch_discover, one per event loop."""
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None or entry[1] != _config_version:  # none yet, or built before configure()
+        entry = _async_clients[loop] = (
+            httpx.AsyncClient(timeout=30, headers=_headers(), http2=True, limits=_ASYNC_LIMITS),
+            _config_version,
+        )
+    return entry[0]
+
+
+async def aclose():
+    """
+    Close the async client of the running event loop. Call it before the
+    loop ends (e.g. last thing in the coroutine given to asyncio.run), once
+    no other task on the loop is using the SDK, or its connections are left
+    open.
+    """
+    entry = _async_clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[0].aclose()
+
+
+def _discover_payload(need, category, protocols, min_quality, max_results) -> dict:
+    return {
+        "need": need,
+        "category": category,
+        "protocols": protocols,
+        "min_quality": min_quality,
+        "max_results": max_results,
+    }
 
 
 def discover(
@@ -72,31 +172,81 @@ def discover(
     """
     response = _get_client().post(
         f"{DEFAULT_ENDPOINT}/discover",
-        json={
-            "need": need,
-            "category": category,
-            "protocols": protocols,
-            "min_quality": min_quality,
-            "max_results": max_results,
-        },
+        json=_discover_payload(need, category, protocols, min_quality, max_results),
     )
     response.raise_for_status()
-    data = response.json()
+    data = _loads(response.content)
     return data.get("results", [])
 
 
+def batch_discover(
+    needs: list,
+    category: Optional[str] = None,
+    protocols: Optional[list] = None,
+    min_quality: float = 0.0,
+    max_results: int = 10,
+) -> list:
+    """
+    Run discover() for several needs concurrently over the shared client.
+
+    Filters apply to every need. Returns one result list per need, in the
+    same order as `needs`.
+    """
+    if not needs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(needs))) as pool:
+        return list(pool.map(
+            lambda need: discover(need, category, protocols, min_quality, max_results),
+            needs,
+        ))
+
+
+async def adiscover(
+    need: str,
+    category: Optional[str] = None,
+    protocols: Optional[list] = None,
+    min_quality: float = 0.0,
+    max_results: int = 10,
+) -> list:
+    """Async version of discover()."""
+    response = await _get_async_client().post(
+        f"{DEFAULT_ENDPOINT}/discover",
+        json=_discover_payload(need, category, protocols, min_quality, max_results),
+    )
+    response.raise_for_status()
+    data = _loads(response.content)
+    return data.get("results", [])
+
+
+async def abatch_discover(
+    needs: list,
+    category: Optional[str] = None,
+    protocols: Optional[list] = None,
+    min_quality: float = 0.0,
+    max_results: int = 10,
+) -> list:
+    """Async version of batch_discover(); results are in the order of `needs`."""
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def one(need):
+        async with sem:
+            return await adiscover(need, category, protocols, min_quality, max_results)
+
+    return list(await asyncio.gather(*(one(need) for need in needs)))
+
+
 def get_agent(agent_id: str) -> dict:
     """Get detailed info about a specific agent."""
     response = _get_client().get(f"{DEFAULT_ENDPOINT}/agent/{agent_id}")
     response.raise_for_status()
-    return response.json().get("agent", {})
+    return _loads(response.content).get("agent", {})
 
 
 def stats() -> dict:
     """Get index statistics."""
     response = _get_client().get(f"{DEFAULT_ENDPOINT}/stats")
     response.raise_for_status()
-    return response.json()
+    return _loads(response.content)
 
 
 def register(agent_name: str = None, agent_url: str = None) -> dict:
@@ -106,4 +256,4 @@ def register(agent_name: str = None, agent_url: str = None) -> dict:
         json={"agent_name": agent_name, "agent_url": agent_url},
     )
     response.raise_for_status()
-    return response.json()
+    return _loads(response.content)
@@ -10,7 +10,8 @@ setup(
     url="https://github.com/agentindex/agentindex-sdk-python",
     packages=find_packages(),
     python_requires=">=3.9",
-    install_requires=["httpx>=0.25.0"],
+    install_requires=["httpx[http2]>=0.25.0"],
+    extras_require={"fast": ["orjson>=3.9"]},
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
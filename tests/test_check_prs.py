@@ -0,0 +1,84 @@
+"""
+Tests for check_prs.py — the batched GraphQL lookup of tracked PRs.
+"""
+
+import asyncio
+import io
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+httpx = pytest.importorskip("httpx")
+
+LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pr_monitor.log")
+
+
+@pytest.fixture(scope="module")
+def check_prs():
+    had_log = os.path.exists(LOG_PATH)
+    import check_prs  # opens pr_monitor.log for appending at import
+    yield check_prs
+    if not had_log and os.path.getsize(LOG_PATH) == 0:
+        check_prs._logf.close()
+        os.remove(LOG_PATH)
+
+
+class _FakeClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.queries = []
+
+    async def post(self, url, json):
+        self.queries.append(json["query"])
+        return self.responses.pop(0)
+
+
+def _pr(state="OPEN", merged=False, created="2026-01-02T03:04:05Z"):
+    return {"pullRequest": {"state": state, "merged": merged, "createdAt": created}}
+
+
+class TestFetchPrsGraphql:
+    @pytest.fixture(autouse=True)
+    def _quiet_log(self, check_prs, monkeypatch):
+        monkeypatch.setattr(check_prs, "_logf", io.StringIO())
+        self.module = check_prs
+
+    def _fetch(self, tracked, *responses):
+        client = _FakeClient(*responses)
+        return asyncio.run(self.module.fetch_prs_graphql(client, tracked)), client
+
+    def test_maps_to_rest_shape(self):
+        data = {"data": {
+            "p0": _pr(),
+            "p1": _pr("MERGED", True),
+            "p2": _pr("CLOSED"),
+        }}
+        prs, _ = self._fetch(
+            [("a/open", 1), ("b/merged", 2), ("c/closed", 3)],
+            httpx.Response(200, json=data),
+        )
+        assert prs == {
+            "a/open": {"state": "open", "merged": False, "created_at": "2026-01-02T03:04:05Z"},
+            "b/merged": {"state": "closed", "merged": True, "created_at": "2026-01-02T03:04:05Z"},
+            "c/closed": {"state": "closed", "merged": False, "created_at": "2026-01-02T03:04:05Z"},
+        }
+
+    def test_unresolved_prs_are_left_out(self):
+        data = {"data": {"p0": None, "p1": {"pullRequest": None}, "p2": _pr()}}
+        prs, _ = self._fetch([("a/gone", 1), ("b/nopr", 2), ("c/ok", 3)], httpx.Response(200, json=data))
+        assert list(prs) == ["c/ok"]
+
+    def test_query_aliases_each_pr(self):
+        _, client = self._fetch([("acme/list", "7")], httpx.Response(200, json={"data": {}}))
+        assert 'p0: repository(owner: "acme", name: "list") { pullRequest(number: 7)' in client.queries[0]
+
+    def test_batches_and_skips_a_failed_batch(self, monkeypatch):
+        monkeypatch.setattr(self.module, "GRAPHQL_BATCH_SIZE", 2)
+        prs, client = self._fetch(
+            [("a/x", 1), ("b/x", 2), ("c/x", 3)],
+            httpx.Response(502),
+            httpx.Response(200, json={"data": {"p0": _pr()}}),
+        )
+        assert len(client.queries) == 2
+        assert list(prs) == ["c/x"]
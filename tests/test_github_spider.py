@@ -0,0 +1,84 @@
+"""
+Tests for agentindex/spiders/github_spider.py that need no database or network.
+"""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("github")
+
+from agentindex.spiders import github_spider
+from agentindex.spiders.github_spider import MAX_TAGS, GitHubSpider, _normalize_tags
+
+
+class TestNormalizeTags:
+    def test_lowercases_strips_and_dedupes_in_order(self):
+        tags = [" MCP ", "agent", "mcp", "LLM", "Agent"]
+        assert _normalize_tags(tags) == ["mcp", "agent", "llm"]
+
+    def test_drops_empty_and_missing_tags(self):
+        assert _normalize_tags(["", "  ", None, "ai"]) == ["ai"]
+        assert _normalize_tags(None) == []
+
+    def test_caps_at_max_tags(self):
+        tags = [f"t{i}" for i in range(MAX_TAGS + 5)]
+        assert _normalize_tags(tags) == tags[:MAX_TAGS]
+
+
+class _FakeSession:
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class TestCrawlQueries:
+    @pytest.fixture(autouse=True)
+    def _spider(self, monkeypatch):
+        monkeypatch.setattr(github_spider, "SEARCH_QUERIES", ["first", "second"])
+        monkeypatch.setattr(github_spider.time, "sleep", lambda s: None)
+        spider = GitHubSpider.__new__(GitHubSpider)  # no token, DB or network needed
+        spider.session = _FakeSession()
+        spider._new_rows = {}
+        spider._pending_updates = []
+        self.flushed = []  # (query whose rows were pending, urls)
+
+        def flush_new_rows():
+            rows, spider._new_rows = spider._new_rows, {}
+            if rows:
+                self.flushed.append((self.current, sorted(rows)))
+            return {url: i for i, url in enumerate(rows)}
+
+        monkeypatch.setattr(spider, "_flush_new_rows", flush_new_rows)
+        monkeypatch.setattr(spider, "_flush_updates", lambda: None)
+        self.spider = spider
+
+    def test_rows_of_a_failed_query_are_flushed_before_the_next(self, monkeypatch):
+        def crawl_query(query, max_results):
+            self.current = query
+            self.spider._new_rows[f"https://github.com/acme/{query}"] = {}
+            if query == "first":
+                raise RuntimeError("search failed")
+            return {"found": 1, "new": len(self.spider._flush_new_rows()), "updated": 0, "errors": 0}
+
+        monkeypatch.setattr(self.spider, "_crawl_query", crawl_query)
+        stats = {"queries_run": 0, "repos_found": 0, "repos_new": 0, "repos_updated": 0, "errors": 0}
+        self.spider._crawl_queries(stats, 10, datetime(2026, 1, 1))
+
+        assert self.flushed == [
+            ("first", ["https://github.com/acme/first"]),
+            ("second", ["https://github.com/acme/second"]),
+        ]
+        assert (stats["queries_run"], stats["repos_new"], stats["errors"]) == (1, 2, 1)
+        job = self.spider.session.added[-1]
+        assert job.query == "full_crawl"
+        assert job.started_at == datetime(2026, 1, 1)
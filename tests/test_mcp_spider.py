@@ -0,0 +1,87 @@
+"""
+Tests for McpSpider's GraphQL lookup of repos linked from awesome lists.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+httpx = pytest.importorskip("httpx")
+
+from agentindex.spiders import mcp_spider
+from agentindex.spiders.mcp_spider import McpSpider
+
+
+class _FakeClient:
+    """Answers post() with queued responses and records the requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    async def post(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return self.responses.pop(0)
+
+
+def _spider(client):
+    spider = McpSpider.__new__(McpSpider)  # no DB session needed
+    spider.client = client
+    return spider
+
+
+def _repo_node(name, **overrides):
+    node = {
+        "url": f"https://github.com/acme/{name}",
+        "nameWithOwner": f"acme/{name}",
+        "name": name,
+        "description": "An MCP server",
+        "owner": {"login": "acme"},
+        "primaryLanguage": {"name": "Python"},
+        "stargazerCount": 42,
+        "forkCount": 7,
+        "repositoryTopics": {"nodes": [{"topic": {"name": "mcp"}}, {"topic": {"name": "llm"}}]},
+    }
+    node.update(overrides)
+    return node
+
+
+class TestListedReposGraphql:
+    def test_maps_nodes_to_rest_shape_and_skips_missing(self):
+        data = {"data": {"r0": _repo_node("one"), "r1": None, "r2": _repo_node("two", primaryLanguage=None)}}
+        client = _FakeClient(httpx.Response(200, json=data))
+        pairs = [("acme", "one"), ("acme", "gone"), ("acme", "two")]
+        repos = asyncio.run(_spider(client)._fetch_listed_repos_graphql(pairs))
+
+        assert repos[0] == {
+            "html_url": "https://github.com/acme/one",
+            "full_name": "acme/one",
+            "name": "one",
+            "description": "An MCP server",
+            "owner": {"login": "acme"},
+            "language": "Python",
+            "stargazers_count": 42,
+            "forks_count": 7,
+            "topics": ["mcp", "llm"],
+        }
+        assert [r["full_name"] for r in repos] == ["acme/one", "acme/two"]
+        assert repos[1]["language"] is None
+
+    def test_one_aliased_field_per_pair(self):
+        client = _FakeClient(httpx.Response(200, json={"data": {}}))
+        asyncio.run(_spider(client)._fetch_listed_repos_graphql([("acme", "one"), ("o\"k", "two")]))
+        query = client.requests[0][1]["json"]["query"]
+        assert 'r0: repository(owner: "acme", name: "one")' in query
+        assert 'r1: repository(owner: "o\\"k", name: "two")' in query
+
+    def test_batches_and_survives_a_failed_batch(self, monkeypatch):
+        monkeypatch.setattr(mcp_spider, "GRAPHQL_BATCH_SIZE", 2)
+        client = _FakeClient(
+            httpx.Response(502),
+            httpx.Response(200, json={"data": {"r0": _repo_node("three")}}),
+        )
+        pairs = [("acme", "one"), ("acme", "two"), ("acme", "three")]
+        repos = asyncio.run(_spider(client)._fetch_listed_repos_graphql(pairs))
+        assert len(client.requests) == 2
+        assert [r["name"] for r in repos] == ["three"]
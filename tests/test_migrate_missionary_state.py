@@ -0,0 +1,39 @@
+"""
+Tests for migrate_missionary_state.py — dedup of suggested terms and competitors.
+"""
+
+import orjson
+import pytest
+
+import migrate_missionary_state
+
+
+class TestDedup:
+    @pytest.fixture(autouse=True)
+    def _base(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(migrate_missionary_state, "BASE", str(tmp_path))
+        self.base = tmp_path
+
+    def _migrate(self, history):
+        (self.base / "action_history.json").write_bytes(orjson.dumps(history))
+        migrate_missionary_state.main()
+        return orjson.loads((self.base / "missionary_state.json").read_bytes())
+
+    def test_terms_are_deduped_in_first_seen_order(self):
+        history = [
+            {"type": "add_search_term", "details": {"term": "mcp"}},
+            {"type": "add_search_term", "details": {"term": "agents"}},
+            {"type": "add_search_term", "details": {"term": "mcp"}},
+            {"type": "add_search_term", "details": {"term": ""}},
+            {"type": "add_search_term", "details": {"term": "a2a"}},
+        ]
+        assert self._migrate(history)["search_terms_suggested"] == ["mcp", "agents", "a2a"]
+
+    def test_competitors_are_deduped_by_repo(self):
+        history = [
+            {"type": "new_competitor", "details": {"url": "https://github.com/acme/finder"}},
+            {"type": "spy_new_competitor", "details": {"url": "https://github.com/zeta/index/tree/main"}},
+            {"type": "spy_new_competitor", "details": {"url": "https://github.com/acme/finder/issues"}},
+            {"type": "new_competitor", "details": {"url": "https://example.com/acme"}},
+        ]
+        assert self._migrate(history)["competitors_seen"] == ["acme/finder", "zeta/index"]
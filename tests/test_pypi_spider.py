@@ -0,0 +1,114 @@
+"""
+Tests for PypiSpider's project index: on-disk cache, match keys and name matching.
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+httpx = pytest.importorskip("httpx")
+
+from agentindex.spiders import pypi_spider
+from agentindex.spiders.pypi_spider import PypiSpider
+
+
+class _FakeClient:
+    """Answers get() with queued responses and records the requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    async def get(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return self.responses.pop(0)
+
+
+def _spider(projects=(), client=None):
+    spider = PypiSpider.__new__(PypiSpider)  # no DB session needed
+    spider.client = client
+    spider._projects = list(projects)
+    return spider
+
+
+INDEX = {
+    "projects": [
+        {"name": "old-agent", "_last-serial": 1},
+        {"name": "Crewai_Tools", "_last-serial": 5},
+        {"name": "llm.agent.kit", "_last-serial": 3},
+        {"name": "reagent", "_last-serial": 4},
+    ]
+}
+
+
+class TestProjectIndex:
+    @pytest.fixture(autouse=True)
+    def _cache_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(pypi_spider, "PYPI_INDEX_CACHE_DIR", str(tmp_path))
+        self.cache_dir = tmp_path
+
+    def test_keys_are_normalized_newest_first(self):
+        response = httpx.Response(200, content=json.dumps(INDEX).encode())
+        projects = asyncio.run(_spider(client=_FakeClient(response))._load_project_index())
+        assert projects == [
+            ("-crewai-tools", "Crewai_Tools"),
+            ("-reagent", "reagent"),
+            ("-llm-agent-kit", "llm.agent.kit"),
+            ("-old-agent", "old-agent"),
+        ]
+
+    def test_download_is_saved_with_its_etag(self):
+        body = json.dumps(INDEX).encode()
+        response = httpx.Response(200, content=body, headers={"ETag": '"v1"'})
+        assert asyncio.run(_spider(client=_FakeClient(response))._fetch_project_index()) == body
+        assert (self.cache_dir / "simple.json").read_bytes() == body
+        assert (self.cache_dir / "simple.etag").read_text() == '"v1"'
+
+    def test_fresh_copy_skips_the_request(self):
+        (self.cache_dir / "simple.json").write_bytes(b"{}")
+        client = _FakeClient()
+        assert asyncio.run(_spider(client=client)._fetch_project_index()) == b"{}"
+        assert client.requests == []
+
+    def test_stale_copy_is_revalidated(self):
+        path = self.cache_dir / "simple.json"
+        path.write_bytes(b"{}")
+        (self.cache_dir / "simple.etag").write_text('"v1"')
+        os.utime(path, (0, 0))
+        client = _FakeClient(httpx.Response(304))
+        assert asyncio.run(_spider(client=client)._fetch_project_index()) == b"{}"
+        assert client.requests[0][1]["headers"]["If-None-Match"] == '"v1"'
+
+    def test_stale_copy_is_used_when_download_fails(self):
+        path = self.cache_dir / "simple.json"
+        path.write_bytes(b"{}")
+        os.utime(path, (0, 0))
+        client = _FakeClient(httpx.Response(503))
+        assert asyncio.run(_spider(client=client)._fetch_project_index()) == b"{}"
+
+
+class TestMatchProjects:
+    PROJECTS = [
+        ("-crewai-tools", "Crewai_Tools"),
+        ("-reagent", "reagent"),
+        ("-llm-agent-kit", "llm.agent.kit"),
+        ("-agent-llm", "agent-llm"),
+    ]
+
+    def test_words_match_token_starts_only(self):
+        # "reagent" contains "agent" but no token starts with it
+        assert _spider(self.PROJECTS)._match_projects("agent", 10) == ["llm.agent.kit", "agent-llm"]
+
+    def test_every_word_must_match_in_any_order(self):
+        spider = _spider(self.PROJECTS)
+        assert spider._match_projects("LLM Agent", 10) == ["llm.agent.kit", "agent-llm"]
+        assert spider._match_projects("crewai agent", 10) == []
+
+    def test_prefix_of_a_token_matches(self):
+        assert _spider(self.PROJECTS)._match_projects("crew", 10) == ["Crewai_Tools"]
+
+    def test_stops_at_max_results_keeping_order(self):
+        assert _spider(self.PROJECTS)._match_projects("agent", 1) == ["llm.agent.kit"]
@@ -0,0 +1,105 @@
+"""
+Tests for agentindex/verify.py — section selection, skipping and the result cache.
+"""
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from agentindex import verify
+
+
+class _Check:
+    """A check that counts its calls and returns (or raises) a fixed result."""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.fixture
+def run(monkeypatch, tmp_path):
+    """Run verify.main() over the given sections with a private cache file."""
+    monkeypatch.setattr(verify, "CACHE_PATH", str(tmp_path / "verify_cache.json"))
+
+    def _run(sections, only="", argv=("--no-cache",)):
+        monkeypatch.setattr(verify, "SECTIONS", sections)
+        monkeypatch.setattr(verify, "errors", [])
+        monkeypatch.setattr(verify, "warnings", [])
+        monkeypatch.setenv("AGENTINDEX_VERIFY_ONLY", only)
+        return verify.main(list(argv))
+
+    return _run
+
+
+class TestSectionSelection:
+    def test_runs_every_section_by_default(self, run):
+        a, b = _Check(), _Check()
+        assert run([("a", "A", (), [("x", a)]), ("b", "B", (), [("y", b)])]) == 0
+        assert (a.calls, b.calls) == (1, 1)
+
+    def test_only_runs_selected_sections(self, run):
+        a, b = _Check(), _Check()
+        assert run([("a", "A", (), [("x", a)]), ("b", "B", (), [("y", b)])], only="b") == 0
+        assert (a.calls, b.calls) == (0, 1)
+
+    def test_selector_tolerates_spaces(self, run):
+        a, b = _Check(), _Check()
+        run([("a", "A", (), [("x", a)]), ("b", "B", (), [("y", b)])], only=" a , b ")
+        assert (a.calls, b.calls) == (1, 1)
+
+    def test_unknown_section_fails_without_running(self, run):
+        a = _Check()
+        assert run([("a", "A", (), [("x", a)])], only="a,nope") == 1
+        assert a.calls == 0
+
+
+class TestRequiredSections:
+    def test_failed_requirement_skips_dependent(self, run):
+        db, e2e = _Check(RuntimeError("down")), _Check()
+        sections = [("db", "DB", (), [("connect", db)]), ("e2e", "E2E", ("db",), [("roundtrip", e2e)])]
+        assert run(sections) == 1
+        assert e2e.calls == 0
+        assert verify.errors == ["connect: down"]
+        assert verify.warnings == ["roundtrip: Skipped (db checks failed)"]
+
+    def test_passed_requirement_runs_dependent(self, run):
+        db, e2e = _Check(), _Check()
+        run([("db", "DB", (), [("connect", db)]), ("e2e", "E2E", ("db",), [("roundtrip", e2e)])])
+        assert e2e.calls == 1
+
+    def test_unselected_requirement_does_not_block(self, run):
+        db, e2e = _Check(RuntimeError("down")), _Check()
+        sections = [("db", "DB", (), [("connect", db)]), ("e2e", "E2E", ("db",), [("roundtrip", e2e)])]
+        assert run(sections, only="e2e") == 0
+        assert (db.calls, e2e.calls) == (0, 1)
+
+
+class TestCache:
+    def test_replays_passed_and_warned_checks(self, run):
+        ok, warn = _Check("1.2.3"), _Check(verify.Warn("slow"))
+        sections = [("a", "A", (), [("ok", ok), ("warn", warn)])]
+        run(sections, argv=())
+        run(sections, argv=())
+        assert (ok.calls, warn.calls) == (1, 1)
+        assert verify.warnings == ["warn: slow (cached)"]
+
+    def test_reruns_failed_checks(self, run):
+        broken = _Check(RuntimeError("down"))
+        sections = [("a", "A", (), [("broken", broken)])]
+        run(sections, argv=())
+        assert run(sections, argv=()) == 1
+        assert broken.calls == 2
+
+    def test_no_cache_reruns_everything(self, run):
+        ok = _Check()
+        sections = [("a", "A", (), [("ok", ok)])]
+        run(sections, argv=())
+        run(sections)
+        assert ok.calls == 2